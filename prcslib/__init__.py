@@ -31,19 +31,73 @@ which works on a set of files at once.
 
 from __future__ import absolute_import, unicode_literals
 
-import re
-from os import unlink
-from datetime import datetime
-from email.utils import parsedate
-from subprocess import Popen, PIPE
-from . import sexpdata
+from errno import EPIPE
+from os import environ, fstat, listdir, stat, unlink
+from os.path import dirname, exists, expanduser, join
+
+# Modules which are not needed by short-lived users of this package, such as
+# 'subprocess', 'datetime' and 'email.utils', and the submodules including
+# 'sexpdata' are imported on first use so that 'import prcslib' stays fast.
+# Regular expressions are compiled by '_compile' on first use for the same
+# reason.
 
 # Regular expression pattern for splitting versions.
-_VERSION_PATTERN = re.compile(r"^(.*)\.(\d+)$")
+_VERSION_PATTERN = r"^(.*)\.(\d+)$"
+
+# Matching pattern for common file entries in descriptors, which have a file
+# id, a revision and a mode, and options without any special characters.
+# Atoms "nil" and "t" are excluded since they are not parsed as symbols.
+_FILE_ENTRY_PATTERN = (
+    br"\s*\((A)\s*\((A)\s+(A)\s+(A)\s*\)((?:\s+A)*)\s*\)"
+    .replace(b"A", br"""(?!(?:nil|t)[\s()])[^\s()\[\]"';\\]+"""))
 
 # Matching pattern for info records.
-_INFO_RECORD_PATTERN = \
-    re.compile(r"^([^ ]+) ([^ ]+) (.+) by ([^ ]+) ?(\*DELETED\*)?")
+_INFO_RECORD_PATTERN = r"^([^ ]+) ([^ ]+) (.+) by ([^ ]+) ?(\*DELETED\*)?"
+
+# Submodules which are imported when they are first accessed as attributes.
+_SUBMODULES = frozenset([
+    "binary", "cache", "editor", "pathindex", "rcs", "server", "service",
+    "sexpdata", "stats", "watch",
+])
+
+# Compiled regular expressions by their patterns.
+_compiled = {}
+
+def _compile(pattern):
+    """
+    Return a compiled regular expression for a pattern.
+    """
+    regex = _compiled.get(pattern)
+    if regex is None:
+        import re
+        regex = _compiled[pattern] = re.compile(pattern)
+    return regex
+
+def __getattr__(name):
+    """
+    Import a submodule when it is first accessed.
+
+    This is used by Python 3.7 or later.
+    """
+    if name in _SUBMODULES:
+        from importlib import import_module
+        return import_module("." + name, __name__)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+# Number of RCS files to keep open per project.
+_RCS_FILE_CACHE_SIZE = 64
+
+# Number of file revisions whose annotations are kept per project.
+_ANNOTATION_CACHE_SIZE = 256
+
+# Number of descriptors to keep per project without a memory limit.
+_DESCRIPTOR_CACHE_SIZE = 256
+
+# Request code of the 'FICLONE' ioctl on Linux.
+_FICLONE = 0x40049409
+
+# Size of the chunks in which packages are copied.
+_PACKAGE_CHUNK_SIZE = 64 * 1024
 
 class PrcsError(Exception):
     """
@@ -80,7 +134,7 @@ class PrcsVersion:
                 minor = major.minor()
             major = major.major()
         elif minor is None:
-            match = _VERSION_PATTERN.match(major)
+            match = _compile(_VERSION_PATTERN).match(major)
             major, minor = match.groups()
 
         self._major = str(major)
@@ -128,21 +182,162 @@ class PrcsVersionDescriptor:
     Version descriptor on PRCS.
     """
 
+    # Properties which are kept by 'compact'.
+    _COMPACT_PROPERTIES = (
+        "Project-Version", "Parent-Version", "Merge-Parents", "Version-Log",
+        "Checkin-Time", "Checkin-Login",
+    )
+
     @staticmethod
     def _readdescriptor(name):
-        with open(name, "r") as stream:
-            content = stream.read()
+        # The file is mapped so that its content is not copied into memory.
+        from mmap import mmap, ACCESS_READ
+
+        with open(name, "rb") as stream:
+            if fstat(stream.fileno()).st_size == 0:
+                return PrcsVersionDescriptor._parsecontent(b"")
+            content = mmap(stream.fileno(), 0, access=ACCESS_READ)
+        try:
+            return PrcsVersionDescriptor._parsecontent(content)
+        finally:
+            content.close()
+
+    @staticmethod
+    def _parsecontent(content):
+        """
+        Return the properties and the file entries from descriptor content.
+        """
+        return PrcsVersionDescriptor._parsedescriptor(
+            PrcsVersionDescriptor._bufferevents(content))
+
+    @staticmethod
+    def _bufferevents(content):
+        """
+        Generate parse events from descriptor content.
+
+        Common entries in the 'Files' section are matched as a whole and
+        generated as '("file", entry)' pairs, which saves the events of their
+        atoms.  Recurring atoms such as revisions and options are shared
+        through a symbol table.
+        """
+        from . import sexpdata
+        symbol = sexpdata.Symbol
+        files_symbol = symbol("Files")
+        symbols = {}
+        parser = sexpdata.BufferParser(
+            content, positions=True, symbol_table=symbols)
+        events = parser.events()
+        depth = 0
+        first = False
+        for event, value, span in events:
+            yield event, value
+            if event == "start":
+                depth += 1
+                first = depth == 1
+            elif event == "end":
+                depth -= 1
+            elif first:
+                if value == files_symbol:
+                    break
+                first = False
+        else:
+            return
+
+        def intern(token):
+            token = token.decode("utf-8")
+            atom = symbols.get(token)
+            if atom is None:
+                atom = symbols[token] = symbol(token)
+            return atom
+
+        match = _compile(_FILE_ENTRY_PATTERN).match
+        i = span[1]
+        while True:
+            entry = match(content, i)
+            if entry is not None:
+                name, file_id, revision, mode, options = entry.groups()
+                yield "file", (
+                    symbol(name.decode("utf-8")),
+                    [symbol(file_id.decode("utf-8")), intern(revision),
+                     intern(mode)],
+                    [intern(option) for option in options.split()])
+                i = entry.end()
+                continue
+            # Any other entry is parsed by events up to its end, and so is
+            # the rest of the content after the 'Files' section.
+            depth = 1
+            events = parser.events(i, ")")
+            for event, value, span in events:
+                yield event, value
+                if event == "start":
+                    depth += 1
+                elif event == "end":
+                    depth -= 1
+                    if depth == 0:
+                        for event, value, span in events:
+                            yield event, value
+                        return
+                if depth == 1:
+                    break
+            else:
+                return
+            i = span[1]
+
+    @staticmethod
+    def _parsedescriptor(events):
+        """
+        Return the properties and the file entries from parse events.
+
+        Each file entry is a tuple of the name, the file information list and
+        the option list.  The atoms in file entries may be symbols or strings.
+        Events may also be '("file", entry)' pairs of whole file entries.
+        """
+        from . import sexpdata
+        symbol = sexpdata.Symbol
+        files_symbol = symbol("Files")
+        properties = {}
+        files = []
+        # Stack of the lists being built and their opening brackets.
+        stack = []
+        infiles = False
+        for event, value in events:
+            if event == "start":
+                if not stack:
+                    infiles = False
+                stack.append(([], value))
+            elif event == "end":
+                sexp, bra = stack.pop()
+                if not stack:
+                    if bra == "(" and sexp \
+                            and isinstance(sexp[0], symbol):
+                        properties[sexp[0].value()] = sexp[1:]
+                elif infiles and len(stack) == 1:
+                    # File entries are not kept as a part of the tree.
+                    if len(sexp) >= 2:
+                        files.append((sexp[0], sexp[1], sexp[2:]))
+                else:
+                    stack[-1][0].append(sexpdata.bracket(sexp, bra))
+            elif event == "file":
+                files.append(value)
+            elif event != "quote" and stack:
+                if len(stack) == 1 and not stack[0][0]:
+                    infiles = value == files_symbol
+                stack[-1][0].append(value)
+        return properties, files
 
-        # Encloses the project descriptor in a single list.
-        data = sexpdata.loads("(\n" + content + "\n)")
-        properties = {
-            i[0].value(): i[1:] for i in data
-            if isinstance(i, list) and isinstance(i[0], sexpdata.Symbol)
-        }
-        return properties
+    def __init__(self, name=None):
+        """
+        Construct a version descriptor from a descriptor file.
 
-    def __init__(self, name):
-        self._properties = self._readdescriptor(name)
+        If 'name' is None, the descriptor is left empty so that its contents
+        can be filled in by a loader such as 'prcslib.binary.load'.
+        """
+        if name is None:
+            self._properties, self._files = {}, []
+        else:
+            self._properties, self._files = self._readdescriptor(name)
+        self._filetable = None
+        self._pathindex = None
 
     def version(self):
         """
@@ -188,65 +383,499 @@ class PrcsVersionDescriptor:
         """
         return self._properties["Version-Log"][0]
 
+    def checkintime(self):
+        """
+        Return the check-in time as a POSIX timestamp, or None if unknown.
+        """
+        from email.utils import mktime_tz, parsedate_tz
+
+        value = self._properties.get("Checkin-Time")
+        if not value:
+            return None
+        date = parsedate_tz(_atomvalue(value[0]))
+        if date is None:
+            return None
+        return mktime_tz(date)
+
     def files(self):
         """
         Return the file information as a dictionary.
+
+        Regular files are mapped to their "id", "revision" and "mode",
+        symbolic links to their "symlink" targets, and directories to
+        '{"directory": True}'.
         """
         files = {}
-        for i in self._properties["Files"]:
-            name = i[0].value()
-            symlink = False
-            for j in i[2:]:
-                if j.value() == ":symlink":
-                    symlink = True
-            if symlink:
+        for name, info, options in self._fileentries():
+            if ":symlink" in options:
+                files[name] = {
+                    "symlink": info[0],
+                }
+            elif ":directory" in options:
                 files[name] = {
-                    "symlink": i[1][0].value(),
+                    "directory": True,
                 }
             else:
                 files[name] = {
-                    "id": i[1][0].value(),
-                    "revision": i[1][1].value(),
-                    "mode": int(i[1][2].value(), 8),
+                    "id": info[0],
+                    "revision": info[1],
+                    "mode": int(info[2], 8),
                 }
         return files
 
+    def _getfiletable(self):
+        """
+        Return a cached result of 'self.files()', which must not be modified.
+        """
+        if self._filetable is None:
+            self._filetable = self.files()
+        return self._filetable
+
+    def pathindex(self):
+        """
+        Return a cached 'prcslib.pathindex.PathIndex' object for the names in
+        the file table.
+        """
+        if self._pathindex is None:
+            from .pathindex import PathIndex
+            files = self._getfiletable()
+            self._pathindex = PathIndex(
+                files,
+                [name for name, info in files.items() if "directory" in info])
+        return self._pathindex
+
+    def files_under(self, prefix):
+        """
+        Return the file information of the files under a directory as a
+        dictionary.
+        """
+        files = self._getfiletable()
+        return dict(
+            (name, files[name])
+            for name in self.pathindex().files_under(prefix)
+        )
+
+    def glob(self, pattern):
+        """
+        Return the file information of the files which match a glob pattern
+        as a dictionary.
+        """
+        files = self._getfiletable()
+        return dict(
+            (name, files[name]) for name in self.pathindex().glob(pattern))
+
+    def listdir(self, path=""):
+        """
+        Return a sorted list of the entries in a directory, where the names
+        of subdirectories end with a slash.
+        """
+        return self.pathindex().listdir(path)
+
+    def _fileentries(self):
+        """
+        Generate the file entries with their atoms as strings.
+        """
+        value = _atomvalue
+        for name, info, options in self._files:
+            yield (
+                value(name),
+                list(map(value, info)),
+                list(map(value, options)) if options else [],
+            )
+
+    def compact(self):
+        """
+        Return a copy of the descriptor which keeps only the properties used
+        by its methods and holds the file entries as plain strings.
+
+        The copy refers to neither the parsed content nor its symbols, and
+        equal strings in its file entries are shared, so it takes much less
+        memory than a descriptor with the whole tree.
+        """
+        properties = {}
+        for key in self._COMPACT_PROPERTIES:
+            value = self._properties.get(key)
+            if value is not None:
+                properties[key] = _detach(value)
+        strings = {}
+        share = strings.setdefault
+        files = [
+            (name, [share(i, i) for i in info],
+             [share(i, i) for i in options])
+            for name, info, options in self._fileentries()
+        ]
+        return _makedescriptor(properties, files)
+
+def _detach(sexp):
+    """
+    Return a copy of an S-expression with its symbols replaced by plain ones,
+    which do not refer to the parsed content.
+    """
+    from .sexpdata import Symbol
+    if isinstance(sexp, list):
+        return [_detach(i) for i in sexp]
+    if isinstance(sexp, Symbol):
+        return Symbol(sexp.value())
+    return sexp
+
+def _repository():
+    """
+    Return the path name of the PRCS repository.
+    """
+    return environ.get("PRCS_REPOSITORY", join(expanduser("~"), "PRCS"))
+
+def _projectstamp(name):
+    """
+    Return a value which changes when a project is checked in to, or None if
+    the project file is missing.
+    """
+    try:
+        status = stat(join(_repository(), name, name + ".prj,v"))
+    except EnvironmentError:
+        return None
+    return (status.st_mtime, status.st_size, status.st_ino)
+
+def _atomvalue(atom):
+    """
+    Return the value of an atom in a file entry.
+    """
+    # Atoms are either strings or S-expression objects, so 'sexpdata' need
+    # not be imported here.
+    if isinstance(atom, type("")):
+        return atom
+    return atom.value()
+
+def _parsedescriptorcontent(content):
+    """
+    Parse descriptor content in a worker process.
+
+    The file entries are returned as plain strings so that the result can be
+    pickled and unpickled cheaply.
+    """
+    properties, files = PrcsVersionDescriptor._parsecontent(content)
+    descriptor = PrcsVersionDescriptor()
+    descriptor._files = files
+    return properties, list(descriptor._fileentries())
+
+def _parsecompactcontent(content):
+    """
+    Parse descriptor content into a compact descriptor in a worker process.
+    """
+    # pylint: disable=protected-access
+    descriptor = _makedescriptor(*_parsedescriptorcontent(content)).compact()
+    return descriptor._properties, descriptor._files
+
+def _makedescriptor(properties, files):
+    """
+    Return a version descriptor with the given properties and file entries.
+    """
+    descriptor = PrcsVersionDescriptor()
+    descriptor._properties = properties
+    descriptor._files = files
+    return descriptor
+
+def _recordkey(record):
+    """
+    Return the default sort key for a summary record of a version.
+    """
+    version = PrcsVersion(record["id"])
+    return (record["date"], record["project"], version.major(),
+            version.minor())
+
+def _compressor(compression):
+    """
+    Return an incremental compressor for a compression format name, or None
+    for no compression.
+    """
+    if compression is None:
+        return None
+    if compression == "gzip":
+        import zlib
+        return zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if compression == "bz2":
+        import bz2
+        return bz2.BZ2Compressor()
+    if compression == "xz":
+        import lzma
+        return lzma.LZMACompressor()
+    raise ValueError("unknown compression: %r" % compression)
+
+def _decompressor(compression):
+    """
+    Return an incremental decompressor for a compression format name, or
+    None for no compression.
+    """
+    if compression is None:
+        return None
+    if compression == "gzip":
+        import zlib
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if compression == "bz2":
+        import bz2
+        return bz2.BZ2Decompressor()
+    if compression == "xz":
+        import lzma
+        return lzma.LZMADecompressor()
+    raise ValueError("unknown compression: %r" % compression)
+
+def _readall(stream, chunks):
+    """
+    Start a daemon thread which reads a stream into a list of chunks.
+    """
+    from threading import Thread
+
+    def run():
+        for chunk in iter(lambda: stream.read(_PACKAGE_CHUNK_SIZE), b""):
+            chunks.append(chunk)
+        stream.close()
+
+    thread = Thread(target=run)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+def _makedirs(path):
+    """
+    Make a directory and its parents unless it exists.
+    """
+    from os import makedirs
+
+    if not exists(path):
+        makedirs(path)
+
+def _reflink(source, target):
+    """
+    Make 'target' a copy of 'source' which shares its data blocks, or a plain
+    copy if the file system cannot do that.
+    """
+    from fcntl import ioctl
+    from shutil import copyfile
+
+    with open(source, "rb") as input_stream:
+        with open(target, "wb") as output_stream:
+            try:
+                ioctl(output_stream.fileno(), _FICLONE, input_stream.fileno())
+                return
+            except EnvironmentError:
+                pass
+    copyfile(source, target)
+
+def comparefiles(files1, files2):
+    """
+    Compare two file tables returned by 'PrcsVersionDescriptor.files'.
+
+    The result is a dictionary of sorted lists of the names which are
+    "added" to, "removed" from or "modified" in 'files2'.
+    """
+    added = []
+    modified = []
+    for name, info in files2.items():
+        info1 = files1.get(name)
+        if info1 is None:
+            added.append(name)
+        elif info1 != info:
+            modified.append(name)
+    removed = [name for name in files1 if name not in files2]
+    return {
+        "added": sorted(added),
+        "removed": sorted(removed),
+        "modified": sorted(modified),
+    }
+
+def _filekeytable(files):
+    """
+    Return a dictionary from the keys of the files in a file table to pairs
+    of their names and file information.
+
+    Regular files are keyed by their file ids so that renamed files are
+    matched, and symbolic links and directories by their names.
+    """
+    table = {}
+    for name, info in files.items():
+        key = info.get("id")
+        if key is None:
+            key = ("directory" if "directory" in info else "symlink", name)
+        table[key] = (name, info)
+    return table
+
+def classifymerge(base, ours, theirs):
+    """
+    Classify the files of a merge from three file tables returned by
+    'PrcsVersionDescriptor.files' for the merge base, our version and their
+    version.
+
+    The result is a dictionary of sorted lists for "ours" (changed only in
+    ours or identically in both), "theirs" (changed only in theirs),
+    "conflict" (changed differently in both), "add" (added only in theirs)
+    and "delete" (deleted only in theirs).  Each item is a dictionary with
+    the "name" and the "base", "ours" and "theirs" pairs of a name and file
+    information, or None where the file is missing.  Unchanged files are not
+    listed.
+    """
+    tables = [_filekeytable(i) for i in (base, ours, theirs)]
+    plan = dict((i, []) for i in ("ours", "theirs", "conflict", "add",
+                                  "delete"))
+    keys = set(tables[0])
+    keys.update(tables[1])
+    keys.update(tables[2])
+    for key in keys:
+        base_entry, our_entry, their_entry = [
+            table.get(key) for table in tables]
+        if our_entry == their_entry:
+            if our_entry == base_entry or our_entry is None:
+                continue
+            kind = "ours"
+        elif their_entry == base_entry:
+            kind = "ours"
+        elif our_entry == base_entry:
+            if their_entry is None:
+                kind = "delete"
+            elif base_entry is None:
+                kind = "add"
+            else:
+                kind = "theirs"
+        else:
+            kind = "conflict"
+        # The name is the one which the merged version would have.
+        if kind in ("theirs", "add"):
+            entries = [their_entry, our_entry, base_entry]
+        else:
+            entries = [our_entry, their_entry, base_entry]
+        name = next(entry[0] for entry in entries if entry is not None)
+        plan[kind].append({
+            "name": name,
+            "base": base_entry,
+            "ours": our_entry,
+            "theirs": their_entry,
+        })
+    for items in plan.values():
+        items.sort(key=lambda item: item["name"])
+    return plan
+
+def parsedescriptors(contents, max_workers=None):
+    """
+    Return a list of version descriptors parsed from descriptor contents.
+
+    Each descriptor content is a 'bytes' value.  The contents are parsed in
+    parallel by a pool of at most 'max_workers' processes, or one by one if
+    'concurrent.futures' is not available.
+    """
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+    except ImportError:
+        # Python 2.7
+        return [_makedescriptor(*_parsedescriptorcontent(i))
+                for i in contents]
+    with ProcessPoolExecutor(max_workers) as executor:
+        return [
+            _makedescriptor(*i)
+            for i in executor.map(_parsedescriptorcontent, contents)
+        ]
+
 class PrcsProject:
     """
     Project on PRCS.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, memory_limit=None):
         """
         Construct a Project object.
+
+        If 'memory_limit' is not None, descriptors are kept in compact form
+        and those which do not fit in that many bytes are spilled to disk.
+        It is also the default memory limit of the bulk history methods.
         """
         self._command = "prcs"
         self._name = name
+        self._memorylimit = memory_limit
+        from collections import OrderedDict
+
+        # Descriptors of explicit versions never change once checked in.
+        if memory_limit is None:
+            self._descriptors = OrderedDict()
+        else:
+            from .cache import DescriptorCache
+            self._descriptors = DescriptorCache(memory_limit)
+        self._rcsfiles = OrderedDict()
+        # Maps pairs of a file id and a revision to their line owners.
+        self._annotations = OrderedDict()
 
-    def versions(self):
+    def versions(self, **filters):
         """
         Return a dictionary of the summary records for all the versions.
-        """
-        out, err, status = self._run_prcs(["info", "-f", self._name])
-        if status != 0:
-            raise PrcsCommandError(err.decode())
 
+        The keyword arguments are the filters of 'iter_versions'.
+        """
         versions = {}
-        # We use iteration over lines so that we can detect parse errors.
-        for line in out.splitlines():
-            match = _INFO_RECORD_PATTERN.match(line.decode())
-            if match:
-                # Note: the 'prcs info' command returns local times.
-                project, version, date, author, deleted = match.groups()
-                versions[version] = {
-                    "project": project,
-                    "id": version,
-                    "date": datetime(*parsedate(date)[0:6]),
-                    "author": author,
-                    "deleted": bool(deleted),
-                }
+        for record in self.iter_versions(**filters):
+            versions[record["id"]] = record
         return versions
 
+    def iter_versions(self, major=None, since=None, until=None, author=None,
+                      include_deleted=True):
+        """
+        Generate the summary records of the versions.
+
+        If 'major' is given, only the versions of that major version are
+        selected by 'prcs info' itself.  The other filters are applied while
+        the output is read: 'since' and 'until' are inclusive bounds of the
+        dates, 'author' is the name of the author, and deleted versions are
+        skipped unless 'include_deleted' is true.
+        """
+        args = [self._command, "info", "-f"]
+        if major is not None:
+            args.extend(["-r", str(major) + ".*"])
+        args.append(self._name)
+        # Errors go to a file so that a full pipe cannot block the command.
+        from datetime import datetime
+        from email.utils import parsedate
+        from subprocess import Popen, PIPE
+        from tempfile import TemporaryFile
+
+        pattern = _compile(_INFO_RECORD_PATTERN)
+        with TemporaryFile() as err:
+            prcs = Popen(args, stdin=PIPE, stdout=PIPE, stderr=err)
+            prcs.stdin.close()
+            try:
+                # We use iteration over lines so that we can detect parse
+                # errors.
+                for line in prcs.stdout:
+                    match = pattern.match(line.decode().rstrip())
+                    if not match:
+                        continue
+                    project, version, date, name, deleted = match.groups()
+                    if deleted and not include_deleted:
+                        continue
+                    if author is not None and name != author:
+                        continue
+                    if major is not None \
+                            and PrcsVersion(version).major() != str(major):
+                        continue
+                    # Note: the 'prcs info' command returns local times.
+                    date = datetime(*parsedate(date)[0:6])
+                    if since is not None and date < since:
+                        continue
+                    if until is not None and date > until:
+                        continue
+                    yield {
+                        "project": project,
+                        "id": version,
+                        "date": date,
+                        "author": name,
+                        "deleted": bool(deleted),
+                    }
+                prcs.stdout.close()
+                status = prcs.wait()
+            finally:
+                if prcs.returncode is None:
+                    # The caller stopped early.
+                    prcs.kill()
+                    prcs.stdout.close()
+                    prcs.wait()
+            if status != 0:
+                err.seek(0)
+                raise PrcsCommandError(err.read().decode())
+
     def descriptor(self, version=None):
         """
         Return the descriptor for a version.
@@ -259,6 +888,697 @@ class PrcsProject:
             unlink(name)
         return descriptor
 
+    def _cacheddescriptor(self, version):
+        """
+        Return the descriptor for a version, caching it if possible.
+
+        Only explicit versions such as "0.1" are looked up in the cache, since
+        the others, such as "0" or None, are resolved to the latest version
+        when they are checked out.  Descriptors are checked out into temporary
+        directories so that this method can be used from multiple threads.
+        """
+        descriptors = self._descriptors
+        descriptor = None
+        if version is not None:
+            version = str(version)
+            if _compile(_VERSION_PATTERN).match(version):
+                if self._memorylimit is None:
+                    # It is inserted again as the most recently used one.
+                    descriptor = descriptors.pop(version, None)
+                else:
+                    descriptor = descriptors.get(version)
+        if descriptor is None:
+            descriptor = self._fetchdescriptor(version)
+            if self._memorylimit is not None:
+                descriptor = descriptor.compact()
+            version = str(descriptor.version())
+        elif self._memorylimit is not None:
+            return descriptor
+        descriptors[version] = descriptor
+        if self._memorylimit is None:
+            while len(descriptors) > _DESCRIPTOR_CACHE_SIZE:
+                descriptors.popitem(last=False)
+        return descriptor
+
+    def read_file(self, version, path):
+        """
+        Return the content of a file in a version as a 'bytes' value.
+
+        The content is reconstructed from the RCS file in the repository
+        without running PRCS, so no keywords are expanded.
+        """
+        info = self._cacheddescriptor(version)._getfiletable().get(path)
+        if info is None:
+            raise PrcsError("no file %s in version %s" % (path, version))
+        if "id" not in info:
+            raise PrcsError("%s is not a regular file" % path)
+        return self._rcsfile(info["id"]).text(info["revision"])
+
+    def _rcsfile(self, file_id):
+        """
+        Return the RCS file for a file id from a small LRU cache.
+        """
+        from .rcs import RcsFile
+
+        rcsfile = self._rcsfiles.pop(file_id, None)
+        if rcsfile is None:
+            rcsfile = RcsFile(join(_repository(), file_id + ",v"))
+        self._rcsfiles[file_id] = rcsfile
+        while len(self._rcsfiles) > _RCS_FILE_CACHE_SIZE:
+            self._rcsfiles.popitem(last=False)
+        return rcsfile
+
+    def _filelines(self, info):
+        """
+        Return the lines of a file described by a file table entry, or an
+        empty list if it is not a regular file.
+        """
+        if info is None or "id" not in info:
+            return []
+        return self._rcsfile(info["id"]).lines(info["revision"])
+
+    def diff(self, version1, version2, paths=None, context=3):
+        """
+        Generate the differences of the files between two versions.
+
+        Each item is a dictionary for a file which was added, removed or
+        modified in 'version2', with the "name", the "status", the file
+        information of the "old" and "new" files, and a list of "hunks".
+        Each hunk has 1-based "old_start" and "new_start" line numbers,
+        "old_count" and "new_count" line counts, and a list of "lines" as
+        pairs of a tag (" ", "-" or "+") and a line as a 'bytes' value.
+        Files are compared one at a time from the RCS files, and only if
+        their revisions differ.
+
+        If 'paths' is given, only the files at or under those path names are
+        compared.
+        """
+        from difflib import SequenceMatcher
+
+        files1 = self._cacheddescriptor(version1)._getfiletable()
+        files2 = self._cacheddescriptor(version2)._getfiletable()
+        changes = comparefiles(files1, files2)
+        names = [(name, status) for status in ["added", "removed", "modified"]
+                 for name in changes[status]]
+        if paths is not None:
+            prefixes = [path.rstrip("/") for path in paths]
+            names = [
+                (name, status) for name, status in names
+                if any(name == prefix or name.startswith(prefix + "/")
+                       for prefix in prefixes)
+            ]
+        names.sort()
+
+        for name, status in names:
+            old = files1.get(name)
+            new = files2.get(name)
+            hunks = []
+            if old is None or new is None or old.get("id") != new.get("id") \
+                    or old.get("revision") != new.get("revision"):
+                lines1 = self._filelines(old)
+                lines2 = self._filelines(new)
+                matcher = SequenceMatcher(None, lines1, lines2)
+                for group in matcher.get_grouped_opcodes(context):
+                    hunk = {
+                        "old_start": group[0][1] + 1,
+                        "old_count": group[-1][2] - group[0][1],
+                        "new_start": group[0][3] + 1,
+                        "new_count": group[-1][4] - group[0][3],
+                        "lines": [],
+                    }
+                    for tag, i1, i2, j1, j2 in group:
+                        if tag == "equal":
+                            hunk["lines"].extend(
+                                (" ", line) for line in lines1[i1:i2])
+                            continue
+                        hunk["lines"].extend(
+                            ("-", line) for line in lines1[i1:i2])
+                        hunk["lines"].extend(
+                            ("+", line) for line in lines2[j1:j2])
+                    hunks.append(hunk)
+            yield {
+                "name": name,
+                "status": status,
+                "old": old,
+                "new": new,
+                "hunks": hunks,
+            }
+
+    def annotate(self, path, version):
+        """
+        Return a list of pairs of the version which last changed each line of
+        a file and the line as a 'bytes' value.
+
+        The history of the file is followed through the parent versions by
+        its file id, so renamed files are followed too, but changes merged
+        from merge parents are attributed to the merging version.  Each
+        distinct revision is read only once, and the line owners of every
+        revision are kept so that annotating a later version only compares
+        the revisions made since.
+        """
+        from difflib import SequenceMatcher
+
+        descriptor = self._cacheddescriptor(version)
+        info = descriptor._getfiletable().get(path)
+        if info is None:
+            raise PrcsError("no file %s in version %s" % (path, version))
+        if "id" not in info:
+            raise PrcsError("%s is not a regular file" % path)
+        file_id = info["id"]
+
+        # Collects the revisions back to one which was annotated before, with
+        # the earliest version of each revision, newest first.
+        revisions = []
+        revision = info["revision"]
+        # The version may be a selector such as None or "0".
+        owner = str(descriptor.version())
+        base = None
+        while True:
+            base = self._annotations.get((file_id, revision))
+            if base is not None:
+                break
+            parent = descriptor.parent()
+            parentinfo = None
+            if parent is not None:
+                descriptor = self._cacheddescriptor(parent)
+                parentinfo = self._findfile(descriptor, path, file_id)
+            if parentinfo is None:
+                revisions.append((owner, revision))
+                break
+            path = parentinfo[0]
+            if parentinfo[1]["revision"] != revision:
+                revisions.append((owner, revision))
+                revision = parentinfo[1]["revision"]
+            owner = str(parent)
+
+        rcsfile = self._rcsfile(file_id)
+        lines1 = owners = None
+        if base is not None:
+            lines1 = rcsfile.lines(revision)
+            owners = base
+        for owner, revision in reversed(revisions):
+            lines2 = rcsfile.lines(revision)
+            if owners is None:
+                owners = [owner] * len(lines2)
+            else:
+                matcher = SequenceMatcher(None, lines1, lines2, False)
+                owners2 = []
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                    if tag == "equal":
+                        owners2.extend(owners[i1:i2])
+                    else:
+                        owners2.extend([owner] * (j2 - j1))
+                owners = owners2
+            self._annotations[(file_id, revision)] = owners
+            while len(self._annotations) > _ANNOTATION_CACHE_SIZE:
+                self._annotations.popitem(last=False)
+            lines1 = lines2
+        return list(zip(owners, lines1))
+
+    @staticmethod
+    def _findfile(descriptor, path, file_id):
+        """
+        Return the name and the file information of a file id in a
+        descriptor, trying 'path' first, or None if not found.
+        """
+        files = descriptor._getfiletable()
+        info = files.get(path)
+        if info is not None and info.get("id") == file_id:
+            return path, info
+        for name, info in files.items():
+            if info.get("id") == file_id:
+                return name, info
+        return None
+
+    def export_tar(self, version, stream, prefix="", compression=None):
+        """
+        Write the files of a version to a binary stream as a tar archive.
+
+        The archive is written with 'tarfile' in stream mode, one file at a
+        time as its content is read from the RCS file, so no working
+        directory is used.  Each name is prefixed with 'prefix', and the
+        parent directories are written before their first files.  Directory
+        entries of the descriptor are written as directories even if they are
+        empty.  No keywords are expanded.  'compression' is None, "gzip",
+        "bz2" or "xz".
+        """
+        import tarfile
+        from io import BytesIO
+
+        suffixes = {None: "", "gzip": "gz", "bz2": "bz2", "xz": "xz"}
+        if compression not in suffixes:
+            raise ValueError("unknown compression: %r" % compression)
+        descriptor = self._cacheddescriptor(version)
+        files = descriptor._getfiletable()
+        mtime = descriptor.checkintime() or 0
+        directories = set()
+        archive = tarfile.open(
+            fileobj=stream, mode="w|" + suffixes[compression])
+        try:
+            for name in sorted(files):
+                info = files[name]
+                parts = name.split("/")
+                for i in range(1, len(parts)):
+                    directory = "/".join(parts[:i])
+                    if directory not in directories:
+                        directories.add(directory)
+                        entry = tarfile.TarInfo(prefix + directory)
+                        entry.type = tarfile.DIRTYPE
+                        entry.mode = 0o755
+                        entry.mtime = mtime
+                        archive.addfile(entry)
+                if "directory" in info:
+                    if name in directories:
+                        continue
+                    directories.add(name)
+                entry = tarfile.TarInfo(prefix + name)
+                entry.mtime = mtime
+                if "directory" in info:
+                    entry.type = tarfile.DIRTYPE
+                    entry.mode = 0o755
+                    archive.addfile(entry)
+                    continue
+                if "symlink" in info:
+                    entry.type = tarfile.SYMTYPE
+                    entry.linkname = info["symlink"]
+                    entry.mode = 0o777
+                    archive.addfile(entry)
+                    continue
+                content = self._rcsfile(info["id"]).text(info["revision"])
+                entry.size = len(content)
+                entry.mode = info["mode"]
+                archive.addfile(entry, BytesIO(content))
+        finally:
+            archive.close()
+
+    def materialize(self, versions, root, link="hardlink"):
+        """
+        Build the working trees of versions under a root directory.
+
+        Each version is built in the subdirectory of its name.  The content
+        of each distinct file id, revision and mode is read from the RCS file
+        once into a shared store in the '.store' subdirectory, and the files
+        of the trees are made from the store by 'link', which is "hardlink",
+        "reflink" or "copy".  Hard links fall back to reflinks across file
+        systems, and reflinks fall back to copies where they are not
+        supported.  Directory entries are made as directories even if they
+        are empty.  As the store is shared by all the versions, no keywords
+        are expanded.
+
+        Return a dictionary from the versions to their directories.
+        """
+        from os import chmod, link as hardlink, rename, symlink
+        from shutil import copyfile
+
+        if link not in ("hardlink", "reflink", "copy"):
+            raise ValueError("invalid link: %r" % link)
+        store = join(root, ".store")
+        _makedirs(store)
+        trees = {}
+        for version in versions:
+            version = str(version)
+            tree = join(root, version)
+            if exists(tree):
+                raise PrcsError("%s already exists" % tree)
+            files = self._cacheddescriptor(version)._getfiletable()
+            for name in sorted(files):
+                info = files[name]
+                path = join(tree, name)
+                if "directory" in info:
+                    _makedirs(path)
+                    continue
+                _makedirs(dirname(path))
+                if "symlink" in info:
+                    symlink(info["symlink"], path)
+                    continue
+                source = join(store, "%s,%s,%o" % (
+                    info["id"].replace("/", "%"), info["revision"],
+                    info["mode"]))
+                if not exists(source):
+                    temporary = source + ".tmp"
+                    with open(temporary, "wb") as stream:
+                        stream.write(self._rcsfile(info["id"])
+                                     .text(info["revision"]))
+                    chmod(temporary, info["mode"])
+                    # Renaming keeps partial files out of the store.
+                    rename(temporary, source)
+                if link == "hardlink":
+                    try:
+                        hardlink(source, path)
+                        continue
+                    except EnvironmentError:
+                        pass
+                if link == "copy":
+                    copyfile(source, path)
+                else:
+                    _reflink(source, path)
+                chmod(path, info["mode"])
+            trees[version] = tree
+        return trees
+
+    def _parentversions(self, version):
+        """
+        Return the parent and the complete merge parents of a version.
+        """
+        descriptor = self._cacheddescriptor(version)
+        parents = []
+        if "Parent-Version" in descriptor._properties:
+            parent = descriptor.parent()
+            if parent is not None:
+                parents.append(str(parent))
+        if "Merge-Parents" in descriptor._properties:
+            parents.extend(str(i) for i in descriptor.mergeparents())
+        return parents
+
+    def mergebase(self, version1, version2):
+        """
+        Return the nearest common ancestor of two versions, or None.
+
+        The parent and merge-parent links are followed from both versions
+        one generation at a time, so only the descriptors of the versions
+        up to the common ancestor are loaded.  If several common ancestors
+        are found in the same generation, the latest version is taken.
+        """
+        sides = [str(version1), str(version2)]
+        visited = [set([sides[0]]), set([sides[1]])]
+        frontiers = [[sides[0]], [sides[1]]]
+        while True:
+            found = visited[0] & visited[1]
+            if found:
+                return max(found, key=lambda i: (
+                    self._cacheddescriptor(i).checkintime() or 0,
+                    PrcsVersion(i).major(), PrcsVersion(i).minor()))
+            if not frontiers[0] and not frontiers[1]:
+                return None
+            for side in (0, 1):
+                frontier = []
+                for version in frontiers[side]:
+                    for parent in self._parentversions(version):
+                        if parent not in visited[side]:
+                            visited[side].add(parent)
+                            frontier.append(parent)
+                frontiers[side] = frontier
+
+    def plan_merge(self, ours, theirs):
+        """
+        Return a plan to merge version 'theirs' into version 'ours'.
+
+        The plan is the result of 'classifymerge' for the file tables of the
+        merge base, 'ours' and 'theirs', with the merge base as "base".  No
+        file contents are read.
+        """
+        base = self.mergebase(ours, theirs)
+        base_files = {}
+        if base is not None:
+            base_files = self._cacheddescriptor(base)._getfiletable()
+        plan = classifymerge(
+            base_files,
+            self._cacheddescriptor(ours)._getfiletable(),
+            self._cacheddescriptor(theirs)._getfiletable())
+        plan["base"] = base
+        return plan
+
+    def iter_history(self, order="date", prefetch=4, memory_limit=None):
+        """
+        Generate pairs of the summary record and the descriptor for each
+        version that is not deleted.
+
+        The versions are ordered by their dates if 'order' is "date".  If it
+        is "topo", each version is also preceded by its parent and merge
+        parents.  Up to 'prefetch' descriptors are checked out and parsed in
+        background threads ahead of the consumer, and no more are started
+        until the consumer takes the next one.
+
+        If 'memory_limit' or the memory limit of the project is not None, the
+        descriptors are generated in compact form, and those waiting for
+        their parents in "topo" order are spilled to disk when they do not
+        fit in that many bytes.
+        """
+        if order not in ("date", "topo"):
+            raise ValueError("invalid order: %r" % order)
+        if memory_limit is None:
+            memory_limit = self._memorylimit
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        records = sorted(
+            (i for i in self.versions().values() if not i["deleted"]),
+            key=lambda i: (
+                i["date"], PrcsVersion(i["id"]).major(),
+                PrcsVersion(i["id"]).minor()))
+        known = set(i["id"] for i in records)
+        emitted = set()
+        # Maps each version to the records waiting for it to be emitted.
+        waiting = {}
+        # Maps the versions of the waiting records to their descriptors.
+        if memory_limit is None:
+            parked = {}
+            fetch = self._fetchdescriptor
+        else:
+            from .cache import DescriptorCache
+            parked = DescriptorCache(memory_limit)
+
+            def fetch(version):
+                return self._fetchdescriptor(version).compact()
+
+        def blocker(descriptor):
+            # Returns a parent which has yet to be emitted, or None.
+            parents = [descriptor.parent()] + descriptor.mergeparents()
+            for parent in parents:
+                if parent is not None and str(parent) in known \
+                        and str(parent) not in emitted:
+                    return str(parent)
+            return None
+
+        def release(version):
+            # Returns the pairs which were waiting for a version.
+            return [
+                (i, parked.pop(i["id"])) for i in waiting.pop(version, [])
+            ]
+
+        try:
+            with ThreadPoolExecutor(max(prefetch, 1)) as executor:
+                pending = deque()
+                remaining = iter(records)
+                for record in remaining:
+                    pending.append(
+                        (record, executor.submit(fetch, record["id"])))
+                    if len(pending) >= prefetch:
+                        break
+                while pending:
+                    record, future = pending.popleft()
+                    # Starts the next fetch before waiting for this one.
+                    for i in remaining:
+                        pending.append((i, executor.submit(fetch, i["id"])))
+                        break
+                    ready = deque([(record, future.result())])
+                    while ready:
+                        item = ready.popleft()
+                        parent = blocker(item[1]) if order == "topo" else None
+                        if parent is not None:
+                            parked[item[0]["id"]] = item[1]
+                            waiting.setdefault(parent, []).append(item[0])
+                            continue
+                        yield item
+                        emitted.add(item[0]["id"])
+                        ready.extend(release(item[0]["id"]))
+
+                # Emits the rest in case any parents were never emitted.
+                for version in list(waiting):
+                    for item in release(version):
+                        yield item
+        finally:
+            # The spilled descriptors are removed even if the consumer stops
+            # early.
+            if memory_limit is not None:
+                parked.close()
+
+    def watch(self, callback=None, **kwds):
+        """
+        Return a started watcher which delivers the records of new versions.
+
+        See 'prcslib.watch.PrcsWatcher' for the details.
+        """
+        from .watch import PrcsWatcher
+        watcher = PrcsWatcher(self._name, callback, **kwds)
+        watcher.start()
+        return watcher
+
+    def _fetchdescriptor(self, version):
+        """
+        Return the descriptor for a version without using the cache.
+        """
+        return _makedescriptor(
+            *self._descriptorcontent(
+                version, PrcsVersionDescriptor._readdescriptor))
+
+    def descriptors(self, versions, max_workers=None, memory_limit=None):
+        """
+        Return a list of the descriptors for versions.
+
+        The descriptors are parsed in parallel by a pool of at most
+        'max_workers' processes while the following ones are checked out.
+
+        If 'memory_limit' or the memory limit of the project is not None, a
+        'prcslib.cache.DescriptorList' object of compact descriptors is
+        returned instead, and those which do not fit in that many bytes are
+        spilled to disk.  Only a few descriptors are checked out ahead of
+        the parsing processes in that case.
+        """
+        if memory_limit is None:
+            memory_limit = self._memorylimit
+        if memory_limit is not None:
+            return self._boundeddescriptors(
+                versions, max_workers, memory_limit)
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _parsedescriptorcontent, self._descriptorcontent(i))
+                for i in versions
+            ]
+            return [_makedescriptor(*i.result()) for i in futures]
+
+    def _boundeddescriptors(self, versions, max_workers, memory_limit):
+        """
+        Return a 'prcslib.cache.DescriptorList' object of the compact
+        descriptors for versions.
+        """
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        from os import cpu_count
+        from .cache import DescriptorCache, DescriptorList
+
+        cache = DescriptorCache(memory_limit)
+        count = 0
+        # Keeps each worker busy with one more content queued.
+        window = 2 * (max_workers or cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers) as executor:
+            pending = deque()
+            for version in versions:
+                pending.append(executor.submit(
+                    _parsecompactcontent, self._descriptorcontent(version)))
+                if len(pending) >= window:
+                    cache[count] = _makedescriptor(*pending.popleft().result())
+                    count += 1
+            while pending:
+                cache[count] = _makedescriptor(*pending.popleft().result())
+                count += 1
+        return DescriptorList(cache, count)
+
+    def _descriptorcontent(self, version=None, reader=None):
+        """
+        Return the content of the descriptor for a version as a 'bytes' value.
+
+        If 'reader' is not None, return what it returns for the name of the
+        descriptor file instead.
+        """
+        from shutil import rmtree
+        from tempfile import mkdtemp
+
+        name = self._name + ".prj"
+        tempdir = mkdtemp()
+        try:
+            self.checkout(version, files=[name], cwd=tempdir)
+            if reader is not None:
+                return reader(join(tempdir, name))
+            with open(join(tempdir, name), "rb") as stream:
+                return stream.read()
+        finally:
+            rmtree(tempdir)
+
+    def export_package(self, stream, compression=None):
+        """
+        Write a package of the project to a binary stream.
+
+        The output of 'prcs package' is copied in chunks as it is produced.
+        'compression' is None, "gzip", "bz2" or "xz".
+        """
+        from subprocess import Popen, PIPE
+
+        compressor = _compressor(compression)
+        prcs = Popen(
+            [self._command, "package", "-f", self._name, "-"],
+            stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        prcs.stdin.close()
+        # Errors are read in another thread so that neither pipe can block.
+        err = []
+        reader = _readall(prcs.stderr, err)
+        finished = False
+        try:
+            for chunk in iter(
+                    lambda: prcs.stdout.read(_PACKAGE_CHUNK_SIZE), b""):
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                stream.write(chunk)
+            if compressor is not None:
+                stream.write(compressor.flush())
+            finished = True
+        finally:
+            prcs.stdout.close()
+            if not finished:
+                prcs.kill()
+            status = prcs.wait()
+            reader.join()
+        if status != 0:
+            raise PrcsCommandError(b"".join(err).decode())
+
+    def import_package(self, stream, compression=None):
+        """
+        Read a package from a binary stream into the repository as this
+        project.
+
+        The package is fed to 'prcs unpackage' in chunks as it is read.
+        'compression' is None, "gzip", "bz2" or "xz".  If the compressed data
+        is corrupt or truncated, the command is killed and the error of the
+        decompressor or a 'PrcsError' exception is raised.
+        """
+        from subprocess import Popen, PIPE
+
+        decompressor = _decompressor(compression)
+        prcs = Popen(
+            [self._command, "unpackage", "-f", "-", self._name],
+            stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        out = []
+        err = []
+        readers = [_readall(prcs.stdout, out), _readall(prcs.stderr, err)]
+        finished = False
+        broken = None
+        try:
+            try:
+                for chunk in iter(
+                        lambda: stream.read(_PACKAGE_CHUNK_SIZE), b""):
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk)
+                    prcs.stdin.write(chunk)
+                # Python 2.7 decompressors cannot tell the end of data.
+                if decompressor is not None \
+                        and not getattr(decompressor, "eof", True):
+                    raise PrcsError("truncated %s data" % compression)
+                prcs.stdin.close()
+            except EnvironmentError as error:
+                if error.errno != EPIPE:
+                    raise
+                # If the command stopped early, its error is reported below.
+                broken = error
+            finished = True
+        finally:
+            if not finished:
+                # A partial package must not be unpacked.  The command is
+                # killed before waiting as it may still be reading its input.
+                prcs.kill()
+            try:
+                prcs.stdin.close()
+            except EnvironmentError:
+                pass
+            status = prcs.wait()
+            for reader in readers:
+                reader.join()
+        if status != 0:
+            raise PrcsCommandError(b"".join(err).decode())
+        if broken is not None:
+            raise broken
+
     def checkout(self, version=None, files=None, cwd=None):
         """
         Check out a version.
@@ -278,9 +1598,96 @@ class PrcsProject:
         """
         Run a PRCS command as a subprocess.
         """
+        from subprocess import Popen, PIPE
+
         if args is None:
             args = []
         prcs = Popen([self._command] + args,
             stdin=PIPE, stdout=PIPE, stderr=PIPE, cwd=cwd)
         out, err = prcs.communicate(stdin)
         return out, err, prcs.returncode
+
+class PrcsRepository:
+    """
+    Repository of PRCS projects.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Construct a Repository object.
+
+        'max_workers' is the maximum number of PRCS commands run at once.
+        """
+        self._max_workers = max_workers
+        # Maps project names to their stamps and version dictionaries.
+        self._versions = {}
+
+    @staticmethod
+    def projects():
+        """
+        Return a sorted list of the names of all the projects.
+        """
+        repository = _repository()
+        try:
+            names = listdir(repository)
+        except EnvironmentError:
+            return []
+        return sorted(
+            name for name in names
+            if _projectstamp(name) is not None
+        )
+
+    def project(self, name):
+        """
+        Return a project in the repository.
+        """
+        return PrcsProject(name)
+
+    def refresh(self, names=None):
+        """
+        Read the versions of the projects which changed since the last call.
+
+        If 'names' is given, only those projects are checked.  Return the
+        list of the names of the projects which were read.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        if names is None:
+            names = self.projects()
+            for name in list(self._versions):
+                if name not in names:
+                    del self._versions[name]
+        stale = []
+        for name in names:
+            stamp = _projectstamp(name)
+            cached = self._versions.get(name)
+            if cached is None or stamp is None or cached[0] != stamp:
+                stale.append((name, stamp))
+        if stale:
+            def read(name):
+                return self.project(name).versions()
+
+            with ThreadPoolExecutor(
+                    min(self._max_workers, len(stale))) as executor:
+                results = executor.map(read, [name for name, __ in stale])
+                for (name, stamp), versions in zip(stale, results):
+                    self._versions[name] = (stamp, versions)
+        return [name for name, __ in stale]
+
+    def versions(self, names=None, key=None):
+        """
+        Return a list of the summary records of all the versions, which is
+        sorted by 'key' or by dates, project names and versions.
+
+        Only the projects changed since the last call are read again.
+        """
+        self.refresh(names)
+        if names is None:
+            names = self._versions
+        records = [
+            record
+            for name in names
+            for record in self._versions[name][1].values()
+        ]
+        records.sort(key=key if key is not None else _recordkey)
+        return records
@@ -0,0 +1,80 @@
+# __main__.py - command-line interface for prcslib
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+command-line interface for prcslib
+
+Run 'python -m prcslib batch' to answer JSON-lines requests from the standard
+input with JSON-lines responses on the standard output in one process, or
+'python -m prcslib serve' to answer the same requests over HTTP on localhost
+or on a Unix domain socket.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import sys
+from argparse import ArgumentParser
+from .server import DEFAULT_PORT, make_server
+from .service import PrcsService
+
+def main(args=None):
+    """
+    Run the command-line interface.
+    """
+    parser = ArgumentParser(prog="python -m prcslib")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser(
+        "batch", help="answer JSON-lines requests from the standard input")
+    serve = subparsers.add_parser(
+        "serve", help="answer requests over HTTP")
+    serve.add_argument(
+        "--host", default="127.0.0.1", help="host address to listen on")
+    serve.add_argument(
+        "--port", type=int, default=DEFAULT_PORT, help="TCP port to listen on")
+    serve.add_argument(
+        "--socket", metavar="PATH",
+        help="listen on a Unix domain socket instead of a TCP port")
+    serve.add_argument(
+        "--verbose", action="store_true", help="log each request")
+    options = parser.parse_args(args)
+
+    if options.command == "batch":
+        PrcsService().serve_lines(sys.stdin, sys.stdout)
+        return 0
+    if options.command == "serve":
+        address = options.socket
+        if address is None:
+            address = (options.host, options.port)
+        server = make_server(address, verbose=options.verbose)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    parser.print_usage(sys.stderr)
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+# binary.py - compact binary format for version descriptors
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Compact binary format for version descriptors
+
+This module serializes the contents of a 'PrcsVersionDescriptor' object so
+that it can be loaded again without parsing the descriptor text.
+
+A serialized descriptor starts with the 'MAGIC' bytes and a format version
+byte, which are followed by a header of unsigned varints, a string table, a
+stream of unsigned varints and an entry table.
+The string table is a single block of UTF-8 text where strings are separated
+by NUL characters, which never appear in descriptors.
+The varint stream holds the properties as tagged S-expression nodes and then
+the file entries of unusual forms with their positions in the file list.
+The entry table holds the rest of the file entries, which have exactly three
+atoms in their file information and no options, as little-endian 32-bit
+string indices of their names and atoms, so that it can be loaded as a whole
+into an array.
+Each atom refers to an entry in the string table, so every distinct string is
+stored and loaded only once.  Atoms in file entries are loaded as plain
+strings, which the descriptor accepts in place of symbols.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import gc
+from array import array
+from sys import byteorder
+from . import PrcsError, PrcsVersionDescriptor
+from .sexpdata import Symbol, Quoted, Bracket
+
+# Magic bytes of the binary format.
+MAGIC = b"PRCSD\0"
+
+# Current version of the binary format.
+FORMAT_VERSION = 2
+
+# Node tags in the varint stream.  Tags from '_ATOM' upward are atoms, whose
+# string index and kind are encoded as '_ATOM + 2 * index + is_string'.
+_LIST = 0
+_BRACKET = 1
+_QUOTED = 2
+_TRUE = 3
+_FALSE = 4
+_ATOM = 5
+
+# Marker for a file entry that cannot use the compact form.  In the compact
+# form, each atom is encoded as its string index and the name is offset by one.
+_GENERIC_ENTRY = 0
+
+# Number of string indices per entry in the entry table.
+_TABLE_WIDTH = 4
+
+# Type code of unsigned 32-bit integers for 'array'.
+_INDEX_TYPE = "I" if array("I").itemsize == 4 else "L"
+
+class PrcsFormatError(PrcsError):
+    """
+    Error in binary descriptor data.
+    """
+
+class _Writer:
+    """
+    Encoder of descriptor contents into the binary format.
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._indices = {}
+        self._stream = bytearray()
+        self._table = array(_INDEX_TYPE)
+        self._others = []
+
+    def varint(self, value):
+        """
+        Append an unsigned varint to the stream.
+        """
+        stream = self._stream
+        while value >= 0x80:
+            stream.append(value & 0x7f | 0x80)
+            value >>= 7
+        stream.append(value)
+
+    def index(self, value):
+        """
+        Return the index of a string in the string table.
+        """
+        index = self._indices.get(value)
+        if index is None:
+            if "\0" in value:
+                raise ValueError("NUL character in " + repr(value))
+            index = self._indices[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def atomcode(self, atom):
+        """
+        Return the tag for an atom, or None if 'atom' is not an atom.
+        """
+        if isinstance(atom, Symbol):
+            return _ATOM + 2 * self.index(atom.value())
+        if isinstance(atom, type("")):
+            return _ATOM + 2 * self.index(atom) + 1
+        return None
+
+    def entryindex(self, atom):
+        """
+        Return the index for an atom in a compact file entry, or None.
+        """
+        if isinstance(atom, Symbol):
+            return self.index(atom.value())
+        if isinstance(atom, type("")):
+            return self.index(atom)
+        return None
+
+    def node(self, sexp):
+        """
+        Append an S-expression node to the stream.
+        """
+        code = self.atomcode(sexp)
+        if code is not None:
+            self.varint(code)
+        elif sexp is True:
+            self.varint(_TRUE)
+        elif sexp is False:
+            self.varint(_FALSE)
+        elif isinstance(sexp, list):
+            self.varint(_LIST)
+            self.nodes(sexp)
+        elif isinstance(sexp, Bracket):
+            self.varint(_BRACKET)
+            self.nodes(sexp.value())
+        elif isinstance(sexp, Quoted):
+            self.varint(_QUOTED)
+            self.node(sexp.value())
+        else:
+            raise TypeError("cannot serialize " + repr(sexp))
+
+    def nodes(self, sexps):
+        """
+        Append a counted sequence of nodes to the stream.
+        """
+        self.varint(len(sexps))
+        for i in sexps:
+            self.node(i)
+
+    def tableentry(self, position, name, info, options):
+        """
+        Add a file entry to the entry table if it has the common form, or
+        keep it to be appended to the stream with its position.
+        """
+        if len(info) == 3 and not options:
+            codes = [self.entryindex(i) for i in [name] + info]
+            if None not in codes:
+                self._table.extend(codes)
+                return
+        self._others.append((position, name, info, options))
+
+    def others(self):
+        """
+        Append the file entries which are not in the entry table.
+        """
+        self.varint(len(self._others))
+        for position, name, info, options in self._others:
+            self.varint(position)
+            self.entry(name, info, options)
+
+    def entry(self, name, info, options):
+        """
+        Append a file entry to the stream.
+        """
+        if isinstance(info, list):
+            codes = [self.entryindex(i) for i in [name] + info + list(options)]
+            if None not in codes:
+                self.varint(codes[0] + 1)
+                self.varint(len(info))
+                for i in codes[1:len(info) + 1]:
+                    self.varint(i)
+                self.varint(len(options))
+                for i in codes[len(info) + 1:]:
+                    self.varint(i)
+                return
+        self.varint(_GENERIC_ENTRY)
+        self.node(name)
+        self.node(info)
+        self.nodes(options)
+
+    def getvalue(self):
+        """
+        Return the encoded data as a 'bytes' value.
+        """
+        blob = "\0".join(self._strings).encode("utf-8")
+        table = self._table
+        if byteorder != "little":
+            table = array(_INDEX_TYPE, table)
+            table.byteswap()
+        header = _Writer()
+        header.varint(len(self._strings))
+        header.varint(len(blob))
+        header.varint(len(self._stream))
+        header.varint(len(table) // _TABLE_WIDTH)
+        if hasattr(table, "tobytes"):
+            table = table.tobytes()
+        else:
+            # Python 2.7
+            table = table.tostring()
+        return b"".join([
+            MAGIC, bytes(bytearray([FORMAT_VERSION])),
+            bytes(header._stream), blob, bytes(self._stream), table,
+        ])
+
+def dumps(descriptor):
+    """
+    Return the contents of a version descriptor in the binary format.
+    """
+    writer = _Writer()
+    # pylint: disable=protected-access
+    properties = descriptor._properties
+    writer.varint(len(properties))
+    for key, value in properties.items():
+        writer.varint(writer.atomcode(key))
+        writer.nodes(value)
+    for position, (name, info, options) in enumerate(descriptor._files):
+        writer.tableentry(position, name, info, options)
+    writer.others()
+    return writer.getvalue()
+
+def dump(descriptor, stream):
+    """
+    Write the contents of a version descriptor to a binary stream.
+    """
+    stream.write(dumps(descriptor))
+
+def _readvarint(data, pos):
+    """
+    Return a varint at 'pos' in 'data' and the position after it.
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+def _decodevarints(data):
+    """
+    Return a list of all the varints in 'data'.
+    """
+    values = []
+    append = values.append
+    value = shift = 0
+    for byte in data:
+        if byte < 0x80:
+            append(value | byte << shift)
+            value = shift = 0
+        else:
+            value |= (byte & 0x7f) << shift
+            shift += 7
+    if shift != 0:
+        raise PrcsFormatError("truncated varint")
+    return values
+
+def _loadtable(data, strings, count):
+    """
+    Return the file entries in an entry table of 'count' entries.
+    """
+    if len(data) != count * _TABLE_WIDTH * 4:
+        raise PrcsFormatError("broken entry table")
+    table = array(_INDEX_TYPE)
+    if hasattr(table, "frombytes"):
+        table.frombytes(data)
+    else:
+        # Python 2.7
+        table.fromstring(bytes(data))
+    if byteorder != "little":
+        table.byteswap()
+    # The cyclic garbage collector is paused as it would otherwise scan the
+    # whole heap repeatedly while the entries are allocated.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        # Converts each column as a whole.
+        getstring = strings.__getitem__
+        names, ids, revisions, modes = [
+            map(getstring, table[i::_TABLE_WIDTH])
+            for i in range(_TABLE_WIDTH)
+        ]
+        return [
+            (name, [file_id, revision, mode], [])
+            for name, file_id, revision, mode
+            in zip(names, ids, revisions, modes)
+        ]
+    except IndexError:
+        raise PrcsFormatError("broken entry table")
+    finally:
+        if enabled:
+            gc.enable()
+
+def _merge(table, others):
+    """
+    Return the entries from the entry table with the others inserted at
+    their positions.
+    """
+    if not others:
+        return table
+    files = []
+    start = 0
+    for position, entry in others:
+        end = start + position - len(files)
+        files.extend(table[start:end])
+        start = end
+        files.append(entry)
+    files.extend(table[start:])
+    return files
+
+def loads(data):
+    """
+    Return a version descriptor loaded from data in the binary format.
+    """
+    data = memoryview(data)
+    if hasattr(data, "cast"):
+        data = data.cast("B")
+    else:
+        # Python 2.7, where items of views are not integers
+        data = bytearray(data)
+    if data[:len(MAGIC)] != MAGIC:
+        raise PrcsFormatError("not a binary descriptor")
+    pos = len(MAGIC)
+    if len(data) <= pos:
+        raise PrcsFormatError("truncated data")
+    if data[pos] != FORMAT_VERSION:
+        raise PrcsFormatError("unsupported format version %d" % data[pos])
+    pos += 1
+
+    # Reads the header and the string table.
+    try:
+        count, pos = _readvarint(data, pos)
+        size, pos = _readvarint(data, pos)
+        streamsize, pos = _readvarint(data, pos)
+        tablesize, pos = _readvarint(data, pos)
+    except IndexError:
+        raise PrcsFormatError("truncated data")
+    strings = bytes(data[pos:pos + size]).decode("utf-8").split("\0")
+    if len(strings) != count:
+        if count != 0 or size != 0:
+            raise PrcsFormatError("broken string table")
+        strings = []
+    pos += size
+    values = _decodevarints(data[pos:pos + streamsize])
+    pos += streamsize
+    table = _loadtable(data[pos:], strings, tablesize)
+    # Symbols are made only for the strings used as symbols.
+    symbols = {}
+    getstring = strings.__getitem__
+
+    # Index into 'values', in a list so that nested functions can update it.
+    state = [0]
+
+    def node():
+        i = state[0]
+        code = values[i]
+        state[0] = i + 1
+        if code >= _ATOM:
+            index, kind = divmod(code - _ATOM, 2)
+            if kind:
+                return strings[index]
+            symbol = symbols.get(index)
+            if symbol is None:
+                symbol = symbols[index] = Symbol(strings[index])
+            return symbol
+        if code == _TRUE:
+            return True
+        if code == _FALSE:
+            return False
+        if code == _QUOTED:
+            return Quoted(node())
+        sexps = nodes()
+        if code == _BRACKET:
+            return Bracket(sexps, "[")
+        return sexps
+
+    def nodes():
+        count = values[state[0]]
+        state[0] += 1
+        return [node() for __ in range(count)]
+
+    try:
+        properties = {}
+        state[0] = 1
+        for __ in range(values[0]):
+            key = node()
+            properties[key] = nodes()
+
+        others = []
+        count = values[state[0]]
+        i = state[0] + 1
+        for __ in range(count):
+            position = values[i]
+            code = values[i + 1]
+            if code == _GENERIC_ENTRY:
+                state[0] = i + 2
+                entry = (node(), node(), nodes())
+                i = state[0]
+            else:
+                end = i + 3 + values[i + 2]
+                info = list(map(getstring, values[i + 3:end]))
+                i = end + 1 + values[end]
+                options = list(map(getstring, values[end + 1:i]))
+                entry = (strings[code - 1], info, options)
+            others.append((position, entry))
+    except IndexError:
+        raise PrcsFormatError("truncated data")
+
+    descriptor = PrcsVersionDescriptor()
+    # pylint: disable=protected-access
+    descriptor._properties = properties
+    descriptor._files = _merge(table, others)
+    return descriptor
+
+def load(stream):
+    """
+    Return a version descriptor loaded from a binary stream.
+    """
+    return loads(stream.read())
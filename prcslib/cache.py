@@ -0,0 +1,256 @@
+# cache.py - memory-bounded cache for version descriptors
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Memory-bounded cache for version descriptors
+
+This module keeps parsed version descriptors within a memory budget.  The
+descriptors are held in memory in least-recently-used order, and those which
+do not fit in the budget are spilled to a temporary directory in the format of
+'prcslib.binary', from which they are loaded again when they are used.
+Descriptors are immutable once checked in, so each of them is written at most
+once.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from collections import OrderedDict
+from threading import Lock
+from . import binary
+
+# Estimated number of bytes a file entry of a compact descriptor takes in
+# memory, measured on Python 3 with distinct names and file ids.
+_ENTRY_SIZE = 512
+
+# Estimated number of bytes a compact descriptor takes besides its files.
+_DESCRIPTOR_SIZE = 4096
+
+def estimatesize(descriptor):
+    """
+    Return the estimated number of bytes a compact descriptor takes in memory.
+    """
+    # pylint: disable=protected-access
+    return _DESCRIPTOR_SIZE + _ENTRY_SIZE * len(descriptor._files)
+
+class DescriptorCache:
+    """
+    Cache of version descriptors whose memory use is bounded by 'limit' bytes.
+
+    The descriptors should be made by 'PrcsVersionDescriptor.compact' since
+    the estimate of their sizes assumes so.  A descriptor which alone exceeds
+    the limit is spilled as soon as another one is stored.  This class is
+    safe to use from multiple threads.
+    """
+
+    def __init__(self, limit, directory=None):
+        """
+        Construct a cache which spills into a temporary directory created in
+        'directory', or in the default one if it is None.
+        """
+        if limit < 0:
+            raise ValueError("negative memory limit")
+        self._limit = limit
+        self._directory = directory
+        self._tempdir = None
+        self._lock = Lock()
+        # Maps keys to pairs of the descriptors and their estimated sizes.
+        self._entries = OrderedDict()
+        self._size = 0
+        # Maps the keys of spilled descriptors to their file names.
+        self._spilled = {}
+        self._serial = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(set(self._entries) | set(self._spilled))
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or key in self._spilled
+
+    def __getitem__(self, key):
+        descriptor = self.get(key)
+        if descriptor is None:
+            raise KeyError(key)
+        return descriptor
+
+    def __setitem__(self, key, descriptor):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+            name = self._spilled.pop(key, None)
+            self._insert(key, descriptor)
+        if name is not None:
+            from os import unlink
+            unlink(name)
+
+    def __delitem__(self, key):
+        if self.pop(key, None) is None:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        """
+        Return the descriptor for a key, or 'default' if there is none.
+
+        A spilled descriptor is loaded and kept in memory again.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Moved to the end as the most recently used one.
+                self._entries[key] = self._entries.pop(key)
+                return entry[0]
+            name = self._spilled.get(key)
+            if name is None:
+                return default
+            with open(name, "rb") as stream:
+                descriptor = binary.load(stream)
+            self._insert(key, descriptor)
+            return descriptor
+
+    def pop(self, key, default=None):
+        """
+        Remove the descriptor for a key and return it, or return 'default' if
+        there is none.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            name = self._spilled.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+        if entry is not None:
+            descriptor = entry[0]
+        elif name is not None:
+            # Loaded without being kept so that nothing else is spilled.
+            with open(name, "rb") as stream:
+                descriptor = binary.load(stream)
+        else:
+            return default
+        if name is not None:
+            from os import unlink
+            unlink(name)
+        return descriptor
+
+    def update(self, descriptors):
+        """
+        Store descriptors from a dictionary.
+        """
+        for key, descriptor in descriptors.items():
+            self[key] = descriptor
+
+    def memoryusage(self):
+        """
+        Return the estimated number of bytes the descriptors in memory take.
+        """
+        return self._size
+
+    def spilled(self):
+        """
+        Return the number of descriptors which are only on disk.
+        """
+        with self._lock:
+            return len(set(self._spilled) - set(self._entries))
+
+    def close(self):
+        """
+        Drop all the descriptors and remove the spill directory.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._spilled.clear()
+            if self._tempdir is not None:
+                from shutil import rmtree
+                rmtree(self._tempdir)
+                self._tempdir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _insert(self, key, descriptor):
+        """
+        Keep a descriptor in memory and spill the least recently used ones
+        which no longer fit in the budget.
+        """
+        size = estimatesize(descriptor)
+        self._entries[key] = (descriptor, size)
+        self._size += size
+        while self._size > self._limit and len(self._entries) > 1:
+            oldkey, (old, oldsize) = self._entries.popitem(last=False)
+            self._size -= oldsize
+            if oldkey not in self._spilled:
+                self._spill(oldkey, old)
+
+    def _spill(self, key, descriptor):
+        """
+        Write a descriptor to the spill directory.
+        """
+        from os.path import join
+        if self._tempdir is None:
+            from tempfile import mkdtemp
+            self._tempdir = mkdtemp(prefix="prcslib-", dir=self._directory)
+        self._serial += 1
+        name = join(self._tempdir, "%d.bin" % self._serial)
+        with open(name, "wb") as stream:
+            binary.dump(descriptor, stream)
+        self._spilled[key] = name
+
+class DescriptorList:
+    """
+    Read-only list of version descriptors held in a 'DescriptorCache' object
+    under the keys from zero to 'count - 1'.
+    """
+
+    def __init__(self, cache, count):
+        """
+        Construct a list of the first 'count' descriptors in 'cache'.
+        """
+        self._cache = cache
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("descriptor index out of range")
+        return self._cache[index]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._cache[i]
+
+    def close(self):
+        """
+        Drop the descriptors and remove their spill directory.
+        """
+        self._cache.close()
+        self._count = 0
@@ -0,0 +1,263 @@
+# editor.py - in-place editor for version descriptors
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+In-place editor for version descriptors
+
+This module edits the content of a version descriptor without rendering it
+again.  The byte spans of the top-level forms and of the entries in the
+'Files' section are recorded when the content is parsed, and only the edited
+spans are replaced when the content is written, so unchanged parts including
+comments and layout are copied as they are.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+from . import PrcsError, PrcsVersionDescriptor, _atomvalue
+from . import sexpdata
+
+# Pattern for atoms which must be written as strings.
+_UNSAFE_ATOM_PATTERN = re.compile(r"""[\s()\[\]"';\\]|^$""")
+
+def _render(value):
+    """
+    Return the text of an S-expression as PRCS writes it.
+
+    Symbols are written as they are unless they contain special characters,
+    strings are quoted with only backslashes and double quotes escaped, and
+    lists are written in parentheses.
+    """
+    if isinstance(value, (list, tuple)):
+        return "(" + " ".join(_render(i) for i in value) + ")"
+    if isinstance(value, sexpdata.Symbol):
+        text = value.value()
+        if _UNSAFE_ATOM_PATTERN.search(text) is None:
+            return text
+        value = text
+    elif not isinstance(value, type("")):
+        return str(value)
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def _symbols(values):
+    """
+    Return a list of symbols for strings.
+    """
+    return [sexpdata.Symbol(i) for i in values]
+
+class PrcsDescriptorEditor:
+    """
+    Editor of the content of a version descriptor.
+    """
+
+    def __init__(self, content):
+        """
+        Construct an editor for descriptor content as a 'bytes' value.
+        """
+        self._content = content
+        # Maps property names to the spans of their forms.
+        self._properties = {}
+        # Maps file names to the spans of their entries.
+        self._files = {}
+        # Offset of the closing parenthesis of the 'Files' section.
+        self._filesend = None
+        # Maps the start offsets of edited spans to pairs of their end
+        # offsets and the replacing text.
+        self._edits = {}
+        # Maps the names of added properties and files to their text.
+        self._newproperties = {}
+        self._newfiles = {}
+        self._scan()
+
+    @classmethod
+    def fromfile(cls, name):
+        """
+        Return an editor for a descriptor file.
+        """
+        with open(name, "rb") as stream:
+            return cls(stream.read())
+
+    def _scan(self):
+        """
+        Record the spans of the properties and the file entries.
+        """
+        depth = 0
+        key = None
+        start = entrystart = None
+        infiles = False
+        name = None
+        for event, value, (begin, end) in sexpdata.iterparse_buffer(
+                self._content, positions=True, symbol_table={}):
+            if event == "start":
+                depth += 1
+                if depth == 1:
+                    start = begin
+                    key = None
+                elif depth == 2 and infiles:
+                    entrystart = begin
+                    name = None
+            elif event == "end":
+                depth -= 1
+                if depth == 0:
+                    if key is not None:
+                        self._properties[key] = (start, end)
+                    if infiles:
+                        self._filesend = begin
+                        infiles = False
+                elif depth == 1 and infiles and name is not None:
+                    self._files[name] = (entrystart, end)
+            elif depth == 1 and key is None:
+                key = _atomvalue(value)
+                infiles = key == "Files"
+            elif depth == 2 and infiles and name is None:
+                name = _atomvalue(value)
+
+    def properties(self):
+        """
+        Return a list of the names of the properties.
+        """
+        return sorted(set(self._properties) | set(self._newproperties))
+
+    def setproperty(self, name, *values):
+        """
+        Replace a property form with one which holds 'values', or add it.
+
+        Each value is a symbol, a string, a number or a list of them.
+        """
+        if name == "Files":
+            raise ValueError("use file methods to edit the Files section")
+        text = _render([sexpdata.Symbol(name)] + list(values))
+        span = self._properties.get(name)
+        if span is None:
+            self._newproperties[name] = text
+        else:
+            self._edits[span[0]] = (span[1], text)
+
+    def setversionlog(self, message):
+        """
+        Set the log message of the version.
+        """
+        self.setproperty("Version-Log", message)
+
+    def setmergeparents(self, parents):
+        """
+        Set the merge parents, each of which is a list of S-expressions such
+        as '[Symbol("0.2"), Symbol("complete")]'.
+        """
+        self.setproperty("Merge-Parents", *parents)
+
+    def setfile(self, name, info, options=()):
+        """
+        Replace the entry of a file, or add it.
+
+        'info' is a list of strings such as '[file_id, revision, mode]', or
+        '[target]' for symbolic links, and 'options' are keywords such as
+        ':symlink'.
+        """
+        text = _render(
+            [sexpdata.Symbol(name), _symbols(info)] + _symbols(options))
+        span = self._files.get(name)
+        if span is None:
+            if self._filesend is None:
+                raise PrcsError("no Files section in the descriptor")
+            self._newfiles[name] = text
+        else:
+            self._edits[span[0]] = (span[1], text)
+
+    def removefile(self, name):
+        """
+        Remove the entry of a file.
+        """
+        if self._newfiles.pop(name, None) is not None:
+            return
+        span = self._files.pop(name, None)
+        if span is None:
+            raise KeyError(name)
+        start, end = span
+        # Removes the whole line if nothing else is on it.
+        content = self._content
+        linestart = content.rfind(b"\n", 0, start) + 1
+        lineend = content.find(b"\n", end)
+        if lineend < 0:
+            lineend = len(content)
+        if not content[linestart:start].strip() \
+                and not content[end:lineend].strip():
+            start, end = linestart, min(lineend + 1, len(content))
+        self._edits[start] = (end, "")
+
+    def chunks(self):
+        """
+        Generate the edited content as a sequence of 'bytes' values, most of
+        which are views of the unchanged parts of the original content.
+        """
+        content = memoryview(self._content)
+        if not hasattr(content, "cast"):
+            # Python 2.7, where views cannot be joined or written
+            content = self._content
+        edits = sorted(self._edits.items())
+        if self._newfiles:
+            text = "".join(
+                "  " + self._newfiles[name] + "\n"
+                for name in sorted(self._newfiles))
+            # New entries go on their own lines before the closing
+            # parenthesis.
+            if self._content.rfind(b"\n", 0, self._filesend) \
+                    < self._content.rfind(b")", 0, self._filesend):
+                text = "\n" + text
+            edits.append((self._filesend, (self._filesend, text)))
+            edits.sort(key=lambda edit: edit[0])
+        position = 0
+        for start, (end, text) in edits:
+            if start < position:
+                continue
+            yield content[position:start]
+            yield text.encode("utf-8")
+            position = end
+        yield content[position:]
+        if self._newproperties and not self._content.endswith(b"\n"):
+            yield b"\n"
+        for name in sorted(self._newproperties):
+            yield (self._newproperties[name] + "\n").encode("utf-8")
+
+    def write(self, stream):
+        """
+        Write the edited content to a binary stream.
+        """
+        for chunk in self.chunks():
+            stream.write(chunk)
+
+    def getvalue(self):
+        """
+        Return the edited content as a 'bytes' value.
+        """
+        return b"".join(self.chunks())
+
+    def descriptor(self):
+        """
+        Return a version descriptor parsed from the edited content.
+        """
+        descriptor = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        descriptor._properties, descriptor._files = \
+            PrcsVersionDescriptor._parsecontent(self.getvalue())
+        return descriptor
@@ -0,0 +1,161 @@
+# pathindex.py - path index over a file table
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Path index over a file table
+
+This module provides an index of the file names of a version so that the
+files under a directory, the files matching a glob pattern and the entries of
+a directory can be found without scanning the whole table.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+
+# Pattern for the characters which start a wildcard in glob patterns.
+_WILDCARD_PATTERN = re.compile(r"[*?[]")
+
+def _prefixrange(names, prefix):
+    """
+    Return the range of the indices of the names which start with 'prefix'
+    in a sorted list.
+    """
+    start = bisect_left(names, prefix)
+    if not prefix:
+        return start, len(names)
+    # The first string after all the strings which start with 'prefix'.
+    limit = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return start, bisect_left(names, limit, start)
+
+class PathIndex:
+    """
+    Index of file names.
+
+    The names are kept in a sorted list and, for suffix lookups, in a sorted
+    list of reversed names.  The directory tree is built when it is first
+    used.
+    """
+
+    def __init__(self, names, directories=()):
+        """
+        Construct an index of file names.
+
+        'directories' gives the names which are directory entries rather than
+        files.
+        """
+        self._names = sorted(names)
+        self._directorynames = frozenset(directories)
+        self._reversed = None
+        self._directories = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def files_under(self, prefix):
+        """
+        Return a sorted list of the names under a directory.
+
+        If 'prefix' does not end with a slash, it is taken as a directory
+        name.  An empty prefix selects all the names.
+        """
+        if prefix and not prefix.endswith("/"):
+            prefix += "/"
+        start, end = _prefixrange(self._names, prefix)
+        return self._names[start:end]
+
+    def glob(self, pattern):
+        """
+        Return a sorted list of the names which match a glob pattern.
+
+        The pattern is matched with 'fnmatch.fnmatchcase', where wildcards
+        also match slashes.  Only the names which share the literal prefix or
+        the literal suffix of the pattern, whichever selects fewer, are
+        tested.
+        """
+        wildcards = [match.start() for match in
+                     _WILDCARD_PATTERN.finditer(pattern)]
+        if not wildcards:
+            start, end = _prefixrange(self._names, pattern)
+            if start < end and self._names[start] == pattern:
+                return [pattern]
+            return []
+
+        start, end = _prefixrange(self._names, pattern[:wildcards[0]])
+        candidates = None
+        last = pattern.rfind("*")
+        suffix = pattern[last + 1:] if last >= 0 else ""
+        if suffix and _WILDCARD_PATTERN.search(suffix) is None:
+            reversed_names = self._reversednames()
+            start2, end2 = _prefixrange(reversed_names, suffix[::-1])
+            if end2 - start2 < end - start:
+                candidates = sorted(
+                    name[::-1] for name in reversed_names[start2:end2])
+        if candidates is None:
+            candidates = self._names[start:end]
+        return [name for name in candidates if fnmatchcase(name, pattern)]
+
+    def listdir(self, path=""):
+        """
+        Return a sorted list of the entries in a directory, where the names
+        of subdirectories end with a slash.
+
+        An empty path is the top directory.  If the directory does not exist,
+        'KeyError' is raised.
+        """
+        path = path.strip("/")
+        return self._getdirectories()[path]
+
+    def _reversednames(self):
+        if self._reversed is None:
+            self._reversed = sorted(name[::-1] for name in self._names)
+        return self._reversed
+
+    def _getdirectories(self):
+        """
+        Return a dictionary from directory names to the sorted lists of their
+        entries.
+        """
+        if self._directories is None:
+            directories = {"": []}
+            # Directory entries are taken with a trailing slash so that they
+            # sort with their files.  Subdirectories are added when they are
+            # first seen, which keeps each list sorted as the names are.
+            names = sorted(
+                name + "/" if name in self._directorynames else name
+                for name in self._names)
+            for name in names:
+                parent = ""
+                parts = name.split("/")
+                for part in parts[:-1]:
+                    path = parent + "/" + part if parent else part
+                    if path not in directories:
+                        directories[path] = []
+                        directories[parent].append(part + "/")
+                    parent = path
+                if parts[-1]:
+                    directories[parent].append(parts[-1])
+            self._directories = directories
+        return self._directories
@@ -0,0 +1,312 @@
+# rcs.py - native reader for RCS files
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Native reader for RCS files
+
+PRCS stores every revision of a file in an RCS file in the repository.  This
+module parses RCS files and reconstructs revisions by applying their deltas
+in memory, without running any external commands.
+
+The revisions are returned as stored, that is, without keyword expansion.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import re
+from collections import OrderedDict
+from . import PrcsError
+
+# Matching pattern for tokens in RCS files.  A string is enclosed by '@' and
+# any '@' in it is doubled.
+_TOKEN_PATTERN = re.compile(
+    br"\s*(?:@([^@]*(?:@@[^@]*)*)@|([;:])|([^\s;:@]+))")
+
+# Matching pattern for revision numbers.
+_NUM_PATTERN = re.compile(br"^[0-9.]+$")
+
+# Matching pattern for edit commands in deltas.
+_COMMAND_PATTERN = re.compile(br"([ad])(\d+) (\d+)")
+
+# Matching pattern for lines, which RCS separates only by LF characters.
+_LINE_PATTERN = re.compile(br"[^\n]*\n|[^\n]+")
+
+# Default number of reconstructed revisions to cache per file.
+DEFAULT_CACHE_SIZE = 64
+
+class RcsError(PrcsError):
+    """
+    Error in an RCS file.
+    """
+
+class _Delta:
+    """
+    Delta node of an RCS file.
+    """
+
+    def __init__(self, revision):
+        self.revision = revision
+        self.date = None
+        self.author = None
+        self.state = None
+        self.branches = []
+        self.next = None
+        self.log = None
+        self.text = None
+
+def _unquote(string):
+    """
+    Return an RCS string with doubled '@' characters restored.
+    """
+    return string.replace(b"@@", b"@")
+
+def _splitlines(text):
+    """
+    Return a list of the lines in text with their line terminators.
+
+    Unlike 'bytes.splitlines', this does not split lines at CR characters so
+    that line numbers match those in RCS deltas.
+    """
+    return _LINE_PATTERN.findall(text)
+
+def _applydelta(lines, delta):
+    """
+    Return the lines with an RCS delta applied.
+    """
+    commands = _splitlines(delta)
+    result = []
+    pos = 0
+    i = 0
+    while i < len(commands):
+        match = _COMMAND_PATTERN.match(commands[i])
+        if not match:
+            raise RcsError("invalid delta command: %r" % commands[i])
+        i += 1
+        command, line, count = match.groups()
+        line = int(line)
+        count = int(count)
+        if command == b"d":
+            # Deletes 'count' lines from the line 'line'.
+            result.extend(lines[pos:line - 1])
+            pos = line - 1 + count
+        else:
+            # Appends 'count' lines after the line 'line'.
+            result.extend(lines[pos:line])
+            pos = line
+            result.extend(commands[i:i + count])
+            i += count
+    result.extend(lines[pos:])
+    return result
+
+class RcsFile:
+    """
+    RCS file.
+    """
+
+    def __init__(self, name, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Construct an RCS file object by reading a file.
+        """
+        with open(name, "rb") as stream:
+            content = stream.read()
+        self._name = name
+        self._head = None
+        self._deltas = OrderedDict()
+        self._parse(content)
+
+        # Maps each revision to the one whose text its delta applies to.
+        # Trunk deltas are reverse deltas and branch deltas are forward ones,
+        # but both are chained by 'next' in the direction of application.
+        self._sources = {}
+        for delta in self._deltas.values():
+            if delta.next is not None:
+                self._sources[delta.next] = delta.revision
+            for branch in delta.branches:
+                self._sources[branch] = delta.revision
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def _parse(self, content):
+        """
+        Parse the content of an RCS file.
+        """
+        tokens = []
+        pos = 0
+        while True:
+            match = _TOKEN_PATTERN.match(content, pos)
+            if not match:
+                break
+            pos = match.end()
+            if match.group(1) is not None:
+                tokens.append((None, match.group(1)))
+            else:
+                tokens.append((match.group(2) or match.group(3), None))
+        if content[pos:].strip():
+            raise RcsError("syntax error in " + self._name)
+        tokens.append((b"", None))
+
+        def isnum(word):
+            return _NUM_PATTERN.match(word) is not None
+
+        def phrase(i):
+            # Returns the values of a phrase up to ';' and the next position.
+            values = []
+            while tokens[i][0] != b";":
+                if not tokens[i][0] and tokens[i][1] is None:
+                    raise RcsError("unexpected end of " + self._name)
+                if tokens[i][0] != b":":
+                    values.append(tokens[i][0] or tokens[i][1])
+                i += 1
+            return values, i + 1
+
+        i = 0
+        # Reads the admin section.
+        while tokens[i][0] and tokens[i][0] != b"desc" \
+                and not isnum(tokens[i][0]):
+            key = tokens[i][0]
+            values, i = phrase(i + 1)
+            if key == b"head" and values:
+                self._head = values[0].decode("ascii")
+
+        # Reads the delta nodes.
+        while tokens[i][0] and isnum(tokens[i][0]):
+            delta = _Delta(tokens[i][0].decode("ascii"))
+            i += 1
+            while tokens[i][0] and tokens[i][0] != b"desc" \
+                    and not isnum(tokens[i][0]):
+                key = tokens[i][0]
+                values, i = phrase(i + 1)
+                values = [x.decode("ascii") for x in values]
+                if key == b"date" and values:
+                    delta.date = values[0]
+                elif key == b"author" and values:
+                    delta.author = values[0]
+                elif key == b"state" and values:
+                    delta.state = values[0]
+                elif key == b"branches":
+                    delta.branches = values
+                elif key == b"next" and values:
+                    delta.next = values[0]
+            self._deltas[delta.revision] = delta
+
+        if tokens[i][0] != b"desc":
+            raise RcsError("missing description in " + self._name)
+        i += 2
+
+        # Reads the delta texts.
+        while tokens[i][0]:
+            revision = tokens[i][0].decode("ascii")
+            delta = self._deltas.get(revision)
+            if delta is None:
+                raise RcsError("unknown revision %s in %s"
+                               % (revision, self._name))
+            i += 1
+            while tokens[i][0] and not isnum(tokens[i][0]):
+                key = tokens[i][0]
+                if key == b"log" or key == b"text":
+                    if tokens[i + 1][1] is None:
+                        raise RcsError("missing string in " + self._name)
+                    setattr(delta, key.decode("ascii"), tokens[i + 1][1])
+                    i += 2
+                else:
+                    __, i = phrase(i + 1)
+
+    def head(self):
+        """
+        Return the head revision.
+        """
+        return self._head
+
+    def revisions(self):
+        """
+        Return a list of all the revisions.
+        """
+        return list(self._deltas)
+
+    def delta(self, revision):
+        """
+        Return a dictionary of the attributes of a revision.
+        """
+        delta = self._getdelta(revision)
+        return {
+            "revision": delta.revision,
+            "date": delta.date,
+            "author": delta.author,
+            "state": delta.state,
+            "log": _unquote(delta.log or b""),
+        }
+
+    def _getdelta(self, revision):
+        """
+        Return the delta node for a revision.
+        """
+        delta = self._deltas.get(revision)
+        if delta is None:
+            raise RcsError("no revision %s in %s" % (revision, self._name))
+        return delta
+
+    def lines(self, revision):
+        """
+        Return a list of the lines of a revision.
+
+        Reconstructed revisions are cached so that reading nearby revisions
+        does not replay the whole delta chain again.
+        """
+        # Finds the nearest revision which is cached or has the full text.
+        path = []
+        lines = None
+        while True:
+            lines = self._cache.get(revision)
+            if lines is not None:
+                # Marks the entry as recently used.
+                del self._cache[revision]
+                self._cache[revision] = lines
+                break
+            delta = self._getdelta(revision)
+            if revision == self._head:
+                lines = _splitlines(_unquote(delta.text or b""))
+                self._store(revision, lines)
+                break
+            path.append(delta)
+            revision = self._sources.get(revision)
+            if revision is None:
+                raise RcsError("broken delta chain in " + self._name)
+
+        for delta in reversed(path):
+            lines = _applydelta(lines, _unquote(delta.text or b""))
+            self._store(delta.revision, lines)
+        return lines
+
+    def _store(self, revision, lines):
+        """
+        Store the lines of a revision in the cache.
+        """
+        self._cache[revision] = lines
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def text(self, revision):
+        """
+        Return the content of a revision as a 'bytes' value.
+        """
+        return b"".join(self.lines(revision))
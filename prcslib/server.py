@@ -0,0 +1,227 @@
+# server.py - local query server for PRCS history
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Local query server for PRCS history
+
+This module provides an HTTP server which answers requests of
+'prcslib.service' for many clients on one host, so that they can share
+project caches, and a thin client for it.  The server listens on a localhost
+TCP port or on a Unix domain socket.  Each request is a JSON object posted
+to the root path, and the response is a JSON object.
+
+Since the server does not authenticate its clients, it answers only the
+queries in 'QUERY_METHODS' and never runs commands which write files, such as
+'checkout'.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+import socket
+from datetime import datetime
+from . import PrcsError
+from .service import PrcsService
+
+try:
+    from http.client import HTTPConnection
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn, UnixStreamServer
+except ImportError:
+    # Python 2.7
+    from httplib import HTTPConnection
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn, UnixStreamServer
+
+# Default TCP port of the server.
+DEFAULT_PORT = 8968
+
+# Names of the service methods the server answers.
+QUERY_METHODS = frozenset(["versions", "descriptor", "files", "diff"])
+
+class PrcsServerError(PrcsError):
+    """
+    Error returned by the server.
+    """
+
+    def __init__(self, error_type, error_message):
+        """
+        Construct an error with the type and message from the server.
+        """
+        super(PrcsServerError, self).__init__(error_type, error_message)
+        self.error_type = error_type
+        self.error_message = error_message
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handler of HTTP requests to the server.
+    """
+
+    def do_POST(self):
+        """
+        Answer a request posted as a JSON object.
+        """
+        length = int(self.headers.get("Content-Length", 0))
+        line = self.rfile.read(length).decode("utf-8")
+        body = self.server.service.handle_line(line, QUERY_METHODS)\
+            .encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        """
+        Return the client address, which is empty on Unix domain sockets.
+        """
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "local"
+
+    def log_message(self, format, *args):
+        # pylint: disable=redefined-builtin
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+class _TcpServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+class _UnixServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        UnixStreamServer.server_bind(self)
+        # Required by 'BaseHTTPRequestHandler'.
+        self.server_name = "localhost"
+        self.server_port = 0
+
+def make_server(address=("127.0.0.1", DEFAULT_PORT), service=None,
+                verbose=False):
+    """
+    Return a threading HTTP server which answers service requests.
+
+    If 'address' is a string, it is the path name of a Unix domain socket.
+    Call 'serve_forever' on the result to run the server.
+    """
+    if isinstance(address, tuple):
+        server = _TcpServer(address, _RequestHandler)
+    else:
+        server = _UnixServer(address, _RequestHandler)
+    server.service = service if service is not None else PrcsService()
+    server.verbose = verbose
+    return server
+
+class _UnixConnection(HTTPConnection):
+    """
+    HTTP connection over a Unix domain socket.
+    """
+
+    def __init__(self, path):
+        HTTPConnection.__init__(self, "localhost")
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+class PrcsClient:
+    """
+    Client of the local query server.
+    """
+
+    def __init__(self, address=("127.0.0.1", DEFAULT_PORT)):
+        """
+        Construct a client for a server address.
+        """
+        self._address = address
+        self._connection = None
+        self._next_id = 1
+
+    def close(self):
+        """
+        Close the connection to the server.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            if isinstance(self._address, tuple):
+                self._connection = HTTPConnection(*self._address)
+            else:
+                self._connection = _UnixConnection(self._address)
+        return self._connection
+
+    def request(self, method, **params):
+        """
+        Send a request to the server and return its result.
+        """
+        request = {"id": self._next_id, "method": method, "params": params}
+        self._next_id += 1
+        body = json.dumps(request).encode("utf-8")
+        try:
+            connection = self._connect()
+            connection.request(
+                "POST", "/", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            data = response.read()
+        except (EnvironmentError, socket.error):
+            self.close()
+            raise
+        response = json.loads(data.decode("utf-8"))
+        if "error" in response:
+            raise PrcsServerError(
+                response["error"]["type"], response["error"]["message"])
+        return response.get("result")
+
+    def versions(self, project):
+        """
+        Return a dictionary of the summary records for all the versions.
+        """
+        versions = self.request("versions", project=project)
+        for record in versions.values():
+            record["date"] = datetime.strptime(
+                record["date"], "%Y-%m-%dT%H:%M:%S")
+        return versions
+
+    def descriptor(self, project, version=None):
+        """
+        Return a dictionary of the version, parent, merge parents and log
+        message of a version.
+        """
+        return self.request("descriptor", project=project, version=version)
+
+    def files(self, project, version=None):
+        """
+        Return the file information of a version as a dictionary.
+        """
+        return self.request("files", project=project, version=version)
+
+    def diff(self, project, version1, version2):
+        """
+        Return the names added, removed or modified between two versions.
+        """
+        return self.request(
+            "diff", project=project, version1=version1, version2=version2)
@@ -0,0 +1,174 @@
+# service.py - request dispatcher for long-lived processes
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Request dispatcher for long-lived processes
+
+This module provides a service object that answers requests on PRCS projects
+and keeps 'PrcsProject' objects and their caches across requests.  A request
+is a dictionary with a "method" name, an optional "params" dictionary and an
+optional "id", which is copied into the response.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+from datetime import datetime
+from threading import Lock
+from . import PrcsCommandError, PrcsProject, comparefiles
+from . import _projectstamp
+
+def _tojson(value):
+    """
+    Return a value converted for JSON serialization.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _tojson(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tojson(i) for i in value]
+    if value is None or isinstance(value, (bool, int, float, type(""))):
+        return value
+    return str(value)
+
+class PrcsService:
+    """
+    Dispatcher of requests on PRCS projects.
+    """
+
+    def __init__(self):
+        """
+        Construct a service object.
+        """
+        self._projects = {}
+        # Maps each project to its versions and the stamp they were read at.
+        self._versions = {}
+        self._lock = Lock()
+
+    def project(self, name):
+        """
+        Return the shared 'PrcsProject' object for a project.
+        """
+        with self._lock:
+            project = self._projects.get(name)
+            if project is None:
+                project = self._projects[name] = PrcsProject(name)
+            return project
+
+    def handle(self, request, methods=None):
+        """
+        Return the response to a request as a dictionary.
+
+        If 'methods' is not None, only the methods named in it are answered.
+        """
+        response = {"id": None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("request must be an object")
+            response["id"] = request.get("id")
+            method = request.get("method")
+            handler = getattr(self, "_do_" + str(method), None)
+            if handler is None or methods is not None \
+                    and method not in methods:
+                raise ValueError("unknown method: %r" % method)
+            params = request.get("params") or {}
+            response["result"] = _tojson(handler(**params))
+        except PrcsCommandError as error:
+            response["error"] = {
+                "type": type(error).__name__,
+                "message": error.error_message,
+            }
+        except Exception as error:
+            # Any error is returned so that a long-lived process survives
+            # bad requests and broken descriptors.
+            response["error"] = {
+                "type": type(error).__name__,
+                "message": str(error),
+            }
+        return response
+
+    def handle_line(self, line, methods=None):
+        """
+        Return the JSON response line to a JSON request line.
+
+        'methods' is the same as in 'handle'.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            response = {
+                "id": None,
+                "error": {"type": "ValueError", "message": str(error)},
+            }
+        else:
+            response = self.handle(request, methods)
+        return json.dumps(response, sort_keys=True)
+
+    def serve_lines(self, input_stream, output_stream):
+        """
+        Answer JSON-lines requests from a text stream until it ends.
+        """
+        for line in input_stream:
+            if not line.strip():
+                continue
+            output_stream.write(self.handle_line(line) + "\n")
+            output_stream.flush()
+
+    def _do_versions(self, project):
+        # The result is reused until the project file in the repository
+        # changes, so that clients do not run 'prcs info' each time.
+        stamp = _projectstamp(project)
+        cached = self._versions.get(project)
+        if stamp is not None and cached is not None and cached[0] == stamp:
+            return cached[1]
+        versions = self.project(project).versions()
+        if stamp is not None:
+            self._versions[project] = (stamp, versions)
+        return versions
+
+    def _do_descriptor(self, project, version=None):
+        # pylint: disable=protected-access
+        descriptor = self.project(project)._cacheddescriptor(version)
+        return {
+            "version": descriptor.version(),
+            "parent": descriptor.parent(),
+            "mergeparents": descriptor.mergeparents(),
+            "message": descriptor.message(),
+        }
+
+    def _do_files(self, project, version=None):
+        # pylint: disable=protected-access
+        return self.project(project)._cacheddescriptor(version)\
+            ._getfiletable()
+
+    def _do_diff(self, project, version1, version2):
+        # pylint: disable=protected-access
+        prcs_project = self.project(project)
+        return comparefiles(
+            prcs_project._cacheddescriptor(version1)._getfiletable(),
+            prcs_project._cacheddescriptor(version2)._getfiletable())
+
+    def _do_checkout(self, project, version=None, files=None, cwd=None):
+        self.project(project).checkout(version, files=files, cwd=cwd)
+        return None
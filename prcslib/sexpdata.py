@@ -68,7 +68,8 @@ __author__ = 'Takafumi Arakaki'
 __license__ = 'BSD License'
 __all__ = [
     # API functions:
-    'load', 'loads', 'dump', 'dumps',
+    'load', 'loads', 'dump', 'dumps', 'iterdump', 'iterparse',
+    'iterparse_buffer',
     # Utility functions:
     'car', 'cdr',
     # S-expression classes:
@@ -188,6 +189,10 @@ def loads(string, **kwds):
     :type     line_comment: str
     :keyword  line_comment: Beginning of line comment.
                             Default is ``';'``.
+    :type     symbol_table: dict or None
+    :keyword  symbol_table: A dictionary to intern symbols in, so that
+                            equal atoms share one object.
+                            Default is ``None``.
 
     >>> loads("(a b)")
     [Symbol('a'), Symbol('b')]
@@ -239,6 +244,12 @@ def loads(string, **kwds):
     >>> loads("nil", false='nil', nil=None)
     False
 
+    Repeated atoms map to one shared object if a symbol table is given:
+
+    >>> sexp = loads("(a a)", symbol_table={})
+    >>> sexp[0] is sexp[1]
+    True
+
     """
     obj = parse(string, **kwds)
     assert len(obj) == 1  # FIXME: raise an appropriate error
@@ -254,6 +265,10 @@ def dump(obj, filelike, **kwds):
 
     See :func:`dumps` for valid keyword arguments.
 
+    The output is the same as :func:`dumps`, but it is written in
+    chunks made by :func:`iterdump`, so large trees are never held as
+    one string.
+
     >>> import io
     >>> fp = io.StringIO()
     >>> dump([Symbol('a'), Symbol('b')], fp)
@@ -261,7 +276,8 @@ def dump(obj, filelike, **kwds):
     (a b)
 
     """
-    filelike.write(unicode(dumps(obj)))
+    for chunk in iterdump(obj, **kwds):
+        filelike.write(chunk)
 
 
 def dumps(obj, **kwds):
@@ -318,6 +334,124 @@ def dumps(obj, **kwds):
     return tosexp(obj, **kwds)
 
 
+def iterdump(obj, chunk_pieces=4096, **kwds):
+    """
+    Generate the S-expression of `obj` in chunks of text.
+
+    The chunks joined together are the same as ``dumps(obj, **kwds)``.
+    Nested lists are walked with an explicit stack instead of recursion,
+    and objects are converted through tables keyed by their exact types.
+    Each chunk is joined from up to `chunk_pieces` pieces.
+
+    >>> for chunk in iterdump([Symbol('a'), [1, 'b'], Quoted(Symbol('c'))]):
+    ...     print(chunk)
+    (a (1 "b") 'c)
+
+    """
+    atoms, containers = _dump_tables(**kwds)
+    pieces = []
+    write = pieces.append
+    # Each entry is an iterator over the items of an open list and its
+    # closing bracket.
+    stack = []
+    items = iter([obj])
+    ket = None
+    first = True
+    while True:
+        for item in items:
+            if not first:
+                write(' ')
+            first = False
+            while type(item) is Quoted:
+                write("'")
+                item = item._val
+            convert = atoms.get(type(item))
+            if convert is not None:
+                write(convert(item))
+                continue
+            open_list = containers.get(type(item))
+            if open_list is None:
+                # Subclasses and unknown types are handled by `tosexp`.
+                write(tosexp(item, **kwds))
+                continue
+            (bra, values, close) = open_list(item)
+            write(bra)
+            stack.append((items, ket))
+            (items, ket) = (iter(values), close)
+            first = True
+            break
+        else:
+            if not stack:
+                break
+            write(ket)
+            (items, ket) = stack.pop()
+            first = False
+        if len(pieces) >= chunk_pieces:
+            yield ''.join(pieces)
+            del pieces[:]
+    if pieces:
+        yield ''.join(pieces)
+
+
+def _dump_symbol(obj):
+    """
+    Return the same text as ``obj.tosexp()`` for a symbol.
+    """
+    val = obj._val
+    if _symbol_special_re.search(val) is None:
+        # Most symbols need no quoting.
+        return tounicode(val)
+    return Symbol.quote(val)
+
+
+def _dump_tables(str_as='string', tuple_as='list',
+                 true_as='t', false_as='()', none_as='()'):
+    """
+    Return the conversion tables of :func:`iterdump` for the options.
+
+    The first table maps types to functions which return the text of
+    an atom, and the second maps types to functions which return the
+    opening bracket, the items and the closing bracket of a list.
+
+    """
+    def invalid(option, value):
+        def convert(obj):
+            raise ValueError(uformat("{0}={1!r} is not valid", option, value))
+        return convert
+
+    if str_as == 'symbol':
+        convert_str = lambda obj: obj
+    elif str_as == 'string':
+        convert_str = lambda obj: String(obj).tosexp()
+    else:
+        convert_str = invalid('str_as', str_as)
+    atoms = {
+        bool: lambda obj: true_as if obj else false_as,
+        type(None): lambda obj: none_as,
+        int: str,
+        float: str,
+        str: convert_str,
+        unicode: convert_str,
+        Symbol: _dump_symbol,
+        BufferSymbol: _dump_symbol,
+        String: String.tosexp,
+    }
+
+    if tuple_as == 'list':
+        open_tuple = lambda obj: ('(', obj, ')')
+    elif tuple_as == 'array':
+        open_tuple = lambda obj: ('[', obj, ']')
+    else:
+        open_tuple = invalid('tuple_as', tuple_as)
+    containers = {
+        list: lambda obj: ('(', obj, ')'),
+        tuple: open_tuple,
+        dict: lambda obj: ('(', dict_to_plist(obj), ')'),
+        Bracket: lambda obj: (obj._bra, obj._val, BRACKETS[obj._bra]),
+    }
+    return (atoms, containers)
+
+
 def car(obj):
     """
     Alias of ``obj[0]``.
@@ -415,6 +549,8 @@ def dict_to_plist(obj):
 
 class SExpBase(object):
 
+    __slots__ = ('_val',)
+
     def __init__(self, val):
         self._val = val
 
@@ -452,6 +588,8 @@ class SExpBase(object):
 
 class Symbol(SExpBase):
 
+    __slots__ = ()
+
     _lisp_quoted_specials = [
         ('\\', '\\\\'),    # must come first to avoid doubly quoting "\"
         ("'", r"\'"), ("`", r"\`"), ('"', r'\"'),
@@ -466,8 +604,48 @@ class Symbol(SExpBase):
         return self.quote(self._val)
 
 
+_symbol_special_re = re.compile(
+    "|".join(re.escape(s) for (s, q) in Symbol._lisp_quoted_specials))
+
+
+class BufferSymbol(Symbol):
+
+    """
+    Symbol which refers to a part of a buffer.
+
+    The name is decoded only when the value is used.  `source` is a
+    ``(buffer, encoding)`` pair, which is shared by the symbols of a
+    buffer.
+
+    """
+
+    __slots__ = ('_source', '_start', '_end')
+
+    def __init__(self, source, start, end):
+        self._source = source
+        self._start = start
+        self._end = end
+
+    def __eq__(self, other):
+        if isinstance(other, Symbol):
+            return self._val == other._val
+        else:
+            return False
+
+    def __reduce__(self):
+        # Pickled as a plain symbol so that the buffer is not copied.
+        return (Symbol, (self._val,))
+
+    @property
+    def _val(self):
+        (buffer, encoding) = self._source
+        return unicode(buffer[self._start:self._end], encoding)
+
+
 class String(SExpBase):
 
+    __slots__ = ()
+
     _lisp_quoted_specials = [  # from Pymacs
         ('\\', '\\\\'),    # must come first to avoid doubly quoting "\"
         ('"', '\\"'), ('\b', '\\b'), ('\f', '\\f'),
@@ -481,12 +659,16 @@ class String(SExpBase):
 
 class Quoted(SExpBase):
 
+    __slots__ = ()
+
     def tosexp(self, tosexp=tosexp):
         return uformat("'{0}", tosexp(self._val))
 
 
 class Bracket(SExpBase):
 
+    __slots__ = ('_bra',)
+
     def __init__(self, val, bra):
         assert bra in BRACKETS  # FIXME: raise an appropriate error
         super(Bracket, self).__init__(val)
@@ -519,6 +701,12 @@ class ExpectClosingBracket(Exception):
             "Got: {1!r}", expect, got))
 
 
+class ExpectValue(IndexError):
+
+    def __init__(self):
+        super(ExpectValue, self).__init__("Nothing to quote.")
+
+
 class ExpectNothing(Exception):
 
     def __init__(self, got):
@@ -538,13 +726,14 @@ class Parser(object):
     quote_or_escape_re = re.compile(r'"|\\')
 
     def __init__(self, string, string_to=None, nil='nil', true='t', false=None,
-                 line_comment=';'):
+                 line_comment=';', symbol_table=None):
         self.string = string
         self.nil = nil
         self.true = true
         self.false = false
         self.string_to = (lambda x: x) if string_to is None else string_to
         self.line_comment = line_comment
+        self.symbol_table = symbol_table
 
     def parse_str(self, i):
         string = self.string
@@ -603,7 +792,13 @@ class Parser(object):
             return True
         if token == self.false:
             return False
-        return Symbol(token)
+        symbol_table = self.symbol_table
+        if symbol_table is None:
+            return Symbol(token)
+        symbol = symbol_table.get(token)
+        if symbol is None:
+            symbol = symbol_table[token] = Symbol(token)
+        return symbol
 
     def parse_sexp(self, i):
         string = self.string
@@ -667,3 +862,403 @@ def parse(string, **kwds):
 
     """
     return Parser(string, **kwds).parse()
+
+
+class EventParser(Parser):
+
+    """
+    Incremental parser which reads a text stream in chunks.
+
+    Only the unconsumed part of the current chunk and the token being
+    read are kept in memory, so the memory usage does not depend on the
+    size of the input.
+
+    """
+
+    def __init__(self, stream, chunk_size=8192, **kwds):
+        super(EventParser, self).__init__('', **kwds)
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.eof = False
+
+    def fill(self, i):
+        """
+        Discard the text before `i` and append the next chunk.
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.string = self.string[i:] + chunk
+
+    def read_str(self, i):
+        """
+        Read a string starting at `i`.
+
+        Return ``(end, value)``, or None if the string continues beyond
+        the current chunk.
+
+        """
+        string = self.string
+        chars = []
+        append = chars.append
+        search = self.quote_or_escape_re.search
+
+        i += 1
+        while True:
+            match = search(string, i)
+            if not match:
+                return None
+            end = match.start()
+            append(string[i:end])
+            if match.group() == '"':
+                return (end + 1, ''.join(chars))
+            if end + 1 >= len(string):
+                return None
+            append(String.unquote(string[end:end + 2]))
+            i = end + 2
+
+    def read_atom(self, i):
+        """
+        Read an atom starting at `i`.
+
+        Return ``(end, value)``, or None if the atom may continue beyond
+        the current chunk.
+
+        """
+        string = self.string
+        chars = []
+        append = chars.append
+        search = self.atom_end_or_escape_re.search
+
+        while True:
+            match = search(string, i)
+            if not match:
+                if not self.eof:
+                    return None
+                append(string[i:])
+                i = len(string)
+                break
+            end = match.start()
+            append(string[i:end])
+            if match.group() != '\\':
+                i = end
+                break
+            if end + 1 >= len(string):
+                if not self.eof:
+                    return None
+                append('\\')
+                i = end + 1
+                break
+            append(Symbol.unquote(string[end:end + 2]))
+            i = end + 2
+        return (i, self.atom(''.join(chars)))
+
+    def events(self):
+        """
+        Generate ``(event, value)`` pairs for the S-expressions in the stream.
+        """
+        stack = []
+        i = 0
+        while True:
+            string = self.string
+            if i >= len(string):
+                if self.eof:
+                    break
+                self.fill(i)
+                i = 0
+                continue
+            c = string[i]
+            if c in whitespace:
+                i += 1
+            elif c in BRACKETS:
+                stack.append(BRACKETS[c])
+                yield ('start', c)
+                i += 1
+            elif c in self.closing_brackets:
+                if not stack:
+                    raise ExpectNothing(string[i:])
+                close = stack.pop()
+                if c != close:
+                    raise ExpectClosingBracket(c, close)
+                yield ('end', c)
+                i += 1
+            elif c == "'":
+                yield ('quote', c)
+                i += 1
+            else:
+                if c == '"':
+                    result = self.read_str(i)
+                elif c == self.line_comment:
+                    end = string.find('\n', i)
+                    if end >= 0:
+                        result = (end + 1, None)
+                    elif self.eof:
+                        result = (len(string), None)
+                    else:
+                        result = None
+                else:
+                    result = self.read_atom(i)
+                if result is None:
+                    if self.eof:
+                        raise ExpectClosingBracket('"', None)
+                    self.fill(i)
+                    i = 0
+                    continue
+                (i, value) = result
+                if c == '"':
+                    yield ('string', self.string_to(value))
+                elif c != self.line_comment:
+                    yield ('atom', value)
+        if stack:
+            raise ExpectClosingBracket(None, stack[-1])
+
+
+def iterparse(stream, chunk_size=8192, **kwds):
+    """
+    Parse S-expressions in a text stream incrementally.
+
+    Generate ``(event, value)`` pairs where `event` is one of
+    ``'start'``, ``'end'``, ``'atom'``, ``'string'`` and ``'quote'``.
+    The value of a ``'start'`` or ``'end'`` event is the bracket
+    character.  See :func:`loads` for valid keyword arguments.
+
+    >>> import io
+    >>> for event in iterparse(io.StringIO('(a "b" [c])')):
+    ...     print(event)
+    ('start', '(')
+    ('atom', Symbol('a'))
+    ('string', 'b')
+    ('start', '[')
+    ('atom', Symbol('c'))
+    ('end', ']')
+    ('end', ')')
+
+    """
+    return EventParser(stream, chunk_size, **kwds).events()
+
+
+class BufferParser(Parser):
+
+    """
+    Parser which works directly on a bytes-like object.
+
+    The buffer may be a `bytes`, `mmap` or `memoryview` object, or only a
+    `str` or `mmap` object on Python 2.7.  It is tokenized with regular
+    expressions on bytes, and each atom is decoded once when it is parsed.
+    If `lazy` is true, atoms without escapes are instead returned as
+    :class:`BufferSymbol` objects which keep offsets into the buffer until
+    their values are used.  This saves decoding only if few of the atoms
+    are used, and the symbols keep the buffer alive.
+
+    If `positions` is true, each event is followed by a ``(start, end)``
+    pair of the offsets of its token in the buffer.  The span of a string
+    includes its quotes.
+
+    """
+
+    token_res = {}
+
+    def __init__(self, buffer, encoding='utf-8', positions=False, lazy=False,
+                 **kwds):
+        super(BufferParser, self).__init__(buffer, **kwds)
+        self.encoding = encoding
+        self.positions = positions
+        self.lazy = lazy
+        self.source = (buffer, encoding)
+        self.specials = dict(
+            (x.encode(encoding), x) for x in (self.nil, self.true, self.false)
+            if x is not None)
+        self.token_re = self.compile_token_re(
+            self.line_comment.encode(encoding), tuple(self.specials))
+
+    @classmethod
+    def compile_token_re(cls, line_comment, specials):
+        key = (line_comment, specials)
+        token_re = cls.token_res.get(key)
+        if token_re is None:
+            # Whitespace and comments are skipped before each token.  Each
+            # character is matched in only one way, as nested repeats would
+            # backtrack exponentially on malformed input.
+            pattern = br"""
+                (?:\s|""" + re.escape(line_comment) + br"""[^\n]*(?=\n|\Z))*
+                (?:
+                    (?P<open>\()
+                    |(?P<close>\))
+                    |(?P<bra>\[)
+                    |(?P<ket>\])
+                    |"(?P<str>(?:[^"\\]|\\.)*)"
+                    |(?P<quote>')
+                    |(?P<special>""" + b"|".join(
+                        re.escape(x) for x in specials) + br""")
+                        (?![^\s()\[\]"'])
+                    |(?P<atom>[^\s()\[\]"'\\]+)(?![^\s()\[\]"'])
+                    |(?P<escaped>(?:[^\s()\[\]"'\\]|\\.)+)
+                    |(?P<end>\Z)
+                )
+            """
+            if not specials:
+                pattern = pattern.replace(b"(?P<special>", b"(?P<special>(?!)")
+            token_re = re.compile(pattern, re.VERBOSE | re.DOTALL)
+            cls.token_res[key] = token_re
+        return token_re
+
+    def buffer_atom(self, start, end):
+        symbol_table = self.symbol_table
+        if not self.lazy:
+            token = unicode(self.string[start:end], self.encoding)
+            if symbol_table is None:
+                return Symbol(token)
+            symbol = symbol_table.get(token)
+            if symbol is None:
+                symbol = symbol_table[token] = Symbol(token)
+            return symbol
+        if symbol_table is None:
+            return BufferSymbol(self.source, start, end)
+        # Raw bytes are used as keys so that atoms need not be decoded.
+        key = bytes(self.string[start:end])
+        symbol = symbol_table.get(key)
+        if symbol is None:
+            symbol = symbol_table[key] = BufferSymbol(self.source, start, end)
+        return symbol
+
+    escape_re = re.compile(r'\\.', re.DOTALL)
+
+    def events(self, start=0, stack=()):
+        """
+        Generate ``(event, value)`` pairs for the S-expressions in the buffer.
+
+        Parsing starts at offset `start` inside lists whose closing
+        brackets are given in `stack`, innermost last.
+
+        """
+        string = self.string
+        encoding = self.encoding
+        positions = self.positions
+        match = self.token_re.match
+        stack = list(stack)
+        i = start
+        len_string = len(string)
+        while i < len_string:
+            m = match(string, i)
+            if not m:
+                raise ExpectClosingBracket('"', None)
+            kind = m.lastgroup
+            (start, i) = m.span(kind)
+            if kind == 'atom':
+                event = ('atom', self.buffer_atom(start, i))
+            elif kind == 'special':
+                event = ('atom', self.atom(self.specials[m.group(kind)]))
+            elif kind == 'str':
+                value = unicode(string[start:i], encoding)
+                if '\\' in value:
+                    value = self.escape_re.sub(
+                        lambda x: String.unquote(x.group()), value)
+                start -= 1
+                i += 1
+                event = ('string', self.string_to(value))
+            elif kind == 'escaped':
+                value = self.escape_re.sub(
+                    lambda x: Symbol.unquote(x.group()),
+                    unicode(string[start:i], encoding))
+                event = ('atom', self.atom(value))
+            elif kind == 'open' or kind == 'bra':
+                c = '(' if kind == 'open' else '['
+                stack.append(BRACKETS[c])
+                event = ('start', c)
+            elif kind == 'quote':
+                event = ('quote', "'")
+            elif kind != 'end':
+                c = ')' if kind == 'close' else ']'
+                if not stack:
+                    raise ExpectNothing(unicode(string[start:], encoding))
+                close = stack.pop()
+                if c != close:
+                    raise ExpectClosingBracket(c, close)
+                event = ('end', c)
+            else:
+                continue
+            if positions:
+                yield event + ((start, i),)
+            else:
+                yield event
+        if stack:
+            raise ExpectClosingBracket(None, stack[-1])
+
+    def parse(self):
+        return build(self.events())
+
+
+def build(events):
+    """
+    Build S-expressions from parse events.
+
+    >>> import io
+    >>> build(iterparse(io.StringIO("(a 'b) [c]")))
+    [[Symbol('a'), Quoted(Symbol('b'))], Bracket([Symbol('c')], '[')]
+
+    """
+    sexp = []
+    stack = []
+    quotes = 0
+    for (event, value) in events:
+        if event == 'start':
+            stack.append((sexp, value, quotes))
+            sexp = []
+            quotes = 0
+            continue
+        elif event == 'quote':
+            quotes += 1
+            continue
+        elif event == 'end':
+            if quotes:
+                raise ExpectValue()
+            value = sexp
+            (sexp, bra, quotes) = stack.pop()
+            value = bracket(value, bra)
+        while quotes:
+            value = Quoted(value)
+            quotes -= 1
+        sexp.append(value)
+    if quotes:
+        raise ExpectValue()
+    return sexp
+
+
+def iterparse_buffer(buffer, **kwds):
+    """
+    Parse S-expressions in a bytes-like object.
+
+    This function generates the same events as :func:`iterparse`.
+    Keyword argument `encoding` specifies the encoding of the buffer,
+    which defaults to ``'utf-8'``.  See :class:`BufferParser` for keyword
+    argument `lazy` and :func:`loads` for other valid keyword arguments.
+
+    >>> for event in iterparse_buffer(memoryview(b'(ab "cd" [ef])')):
+    ...     print(event)
+    ('start', '(')
+    ('atom', Symbol('ab'))
+    ('string', 'cd')
+    ('start', '[')
+    ('atom', Symbol('ef'))
+    ('end', ']')
+    ('end', ')')
+
+    With ``lazy=True``, atoms are decoded only when their values are used.
+
+    >>> for event in iterparse_buffer(b'(ab)', lazy=True):
+    ...     print(event)
+    ('start', '(')
+    ('atom', BufferSymbol('ab'))
+    ('end', ')')
+
+    With ``positions=True``, the offsets of each token are also generated.
+
+    >>> for event in iterparse_buffer(b'(a "b")', positions=True):
+    ...     print(event)
+    ('start', '(', (0, 1))
+    ('atom', Symbol('a'), (1, 2))
+    ('string', 'b', (3, 6))
+    ('end', ')', (6, 7))
+
+    """
+    return BufferParser(buffer, **kwds).events()
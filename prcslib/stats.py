@@ -0,0 +1,269 @@
+# stats.py - churn and authorship statistics over PRCS history
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Churn and authorship statistics over PRCS history
+
+This module counts the files added, removed and modified by each version
+compared with its parent, and sums the counts per version, author, directory
+or time bucket.  File names and file entries are coded as integers once, so
+that the file tables can be compared and the counts summed in batches.
+NumPy is used for the batches if it is installed, and plain Python otherwise.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Kinds of changes, which are also the indices into count triples.
+ADDED = 0
+REMOVED = 1
+MODIFIED = 2
+
+_KINDS = ("added", "removed", "modified")
+
+# Functions which return the time bucket of a date.
+_BUCKETS = {
+    "day": lambda date: date.strftime("%Y-%m-%d"),
+    "week": lambda date: "%04d-W%02d" % date.isocalendar()[0:2],
+    "month": lambda date: date.strftime("%Y-%m"),
+    "year": lambda date: date.strftime("%Y"),
+}
+
+class _Codes:
+    """
+    Table which assigns consecutive integer codes to values.
+    """
+
+    def __init__(self):
+        self.codes = {}
+
+    def code(self, value):
+        """
+        Return the code for a value.
+        """
+        return self.codes.setdefault(value, len(self.codes))
+
+    def values(self):
+        """
+        Return a list of the values in the order of their codes.
+        """
+        values = [None] * len(self.codes)
+        for value, code in self.codes.items():
+            values[code] = value
+        return values
+
+class ChangeTable:
+    """
+    Table of the file changes made by each version.
+
+    Changes are stored in three parallel integer arrays of version indices,
+    kinds and file name codes.
+    """
+
+    def __init__(self, use_numpy=None):
+        """
+        Construct an empty change table.
+
+        If 'use_numpy' is None, NumPy is used if it is available.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise ImportError("NumPy is not available")
+        self._numpy = use_numpy
+        self.records = []
+        self._names = _Codes()
+        self._entries = _Codes()
+        # Maps each version to its file table as a pair of an array of name
+        # codes and an array of entry codes, both ordered by name codes.
+        self._tables = {}
+        self._versions = array(str("l"))
+        self._kinds = array(str("l"))
+        self._files = array(str("l"))
+
+    @classmethod
+    def fromhistory(cls, history, use_numpy=None):
+        """
+        Return a change table built from pairs of a summary record and a
+        descriptor, such as those generated by 'PrcsProject.iter_history'.
+        """
+        table = cls(use_numpy)
+        for record, descriptor in history:
+            table.add(record, descriptor)
+        return table
+
+    def add(self, record, descriptor):
+        """
+        Add the changes of a version compared with its parent.
+
+        The parent must have been added before, or all the files are counted
+        as added.  The file tables of all the added versions are kept in
+        compact arrays so that any of them can be a parent.
+        """
+        # The code tables are updated inline as this runs for every file.
+        names = self._names.codes
+        entries = self._entries.codes
+        # pylint: disable=protected-access
+        pairs = sorted([
+            (names.setdefault(name, len(names)),
+             entries.setdefault(tuple(info + options), len(entries)))
+            for name, info, options in descriptor._fileentries()
+        ])
+        names = array(str("l"), [i[0] for i in pairs])
+        entries = array(str("l"), [i[1] for i in pairs])
+        parent = descriptor.parent()
+        table1 = self._tables.get(str(parent)) if parent is not None else None
+        if table1 is None:
+            table1 = (array(str("l")), array(str("l")))
+
+        index = len(self.records)
+        if self._numpy:
+            changes = self._comparenumpy(table1, (names, entries))
+        else:
+            changes = self._compare(table1, (names, entries))
+        for kind, files in enumerate(changes):
+            self._versions.extend([index] * len(files))
+            self._kinds.extend([kind] * len(files))
+            self._files.extend(files)
+        self.records.append(record)
+        self._tables[str(record["id"])] = (names, entries)
+
+    @staticmethod
+    def _compare(table1, table2):
+        """
+        Return the added, removed and modified name codes between two file
+        tables in plain Python.
+        """
+        entries1 = dict(zip(*table1))
+        added = []
+        modified = []
+        for name, entry in zip(*table2):
+            entry1 = entries1.pop(name, None)
+            if entry1 is None:
+                added.append(name)
+            elif entry1 != entry:
+                modified.append(name)
+        return added, list(entries1), modified
+
+    @staticmethod
+    def _comparenumpy(table1, table2):
+        """
+        Return the added, removed and modified name codes between two file
+        tables with NumPy.
+        """
+        names1 = numpy.frombuffer(table1[0], dtype=table1[0].typecode)
+        names2 = numpy.frombuffer(table2[0], dtype=table2[0].typecode)
+        common, index1, index2 = numpy.intersect1d(
+            names1, names2, assume_unique=True, return_indices=True)
+        entries1 = numpy.frombuffer(table1[1], dtype=table1[1].typecode)
+        entries2 = numpy.frombuffer(table2[1], dtype=table2[1].typecode)
+        modified = common[entries1[index1] != entries2[index2]]
+        return (
+            numpy.setdiff1d(names2, names1, assume_unique=True).tolist(),
+            numpy.setdiff1d(names1, names2, assume_unique=True).tolist(),
+            modified.tolist(),
+        )
+
+    def _count(self, groups, keys):
+        """
+        Return an ordered dictionary from distinct keys to count
+        dictionaries, where 'groups' maps each change to the index of its
+        key.
+        """
+        size = len(keys)
+        if self._numpy:
+            codes = numpy.asarray(groups, dtype=numpy.int64) * 3 \
+                + numpy.frombuffer(self._kinds, dtype=self._kinds.typecode)
+            counts = numpy.bincount(codes, minlength=size * 3).tolist()
+        else:
+            counts = [0] * (size * 3)
+            for group, kind in zip(groups, self._kinds):
+                counts[group * 3 + kind] += 1
+        return OrderedDict(
+            (key, dict(zip(_KINDS, counts[i * 3:i * 3 + 3])))
+            for i, key in enumerate(keys)
+        )
+
+    def byversion(self):
+        """
+        Return the counts of changes per version.
+        """
+        return self._count(
+            self._versions, [record["id"] for record in self.records])
+
+    def byauthor(self):
+        """
+        Return the counts of changes per author.
+        """
+        authors = _Codes()
+        codes = [authors.code(record["author"]) for record in self.records]
+        return self._count(
+            [codes[i] for i in self._versions], authors.values())
+
+    def bydirectory(self):
+        """
+        Return the counts of changes per directory, where the top directory
+        is an empty string.
+        """
+        directories = _Codes()
+        codes = [
+            directories.code(name.rpartition("/")[0])
+            for name in self._names.values()
+        ]
+        return self._count(
+            [codes[i] for i in self._files], directories.values())
+
+    def bybucket(self, bucket="month"):
+        """
+        Return the counts of changes per time bucket, which is one of "day",
+        "week", "month" or "year".
+        """
+        function = _BUCKETS.get(bucket)
+        if function is None:
+            raise ValueError("invalid bucket: %r" % bucket)
+        buckets = _Codes()
+        codes = [
+            buckets.code(function(record["date"])) for record in self.records
+        ]
+        return self._count(
+            [codes[i] for i in self._versions], buckets.values())
+
+def churn(history, bucket="month", use_numpy=None):
+    """
+    Return a churn report of a history as a dictionary of the counts of
+    changes "by_version", "by_author", "by_directory" and "by_bucket".
+    """
+    table = ChangeTable.fromhistory(history, use_numpy)
+    return {
+        "by_version": table.byversion(),
+        "by_author": table.byauthor(),
+        "by_directory": table.bydirectory(),
+        "by_bucket": table.bybucket(bucket),
+    }
@@ -0,0 +1,348 @@
+# watch.py - repository watcher for new PRCS versions
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Repository watcher for new PRCS versions
+
+This module watches the directory of a project in the repository and delivers
+a summary record for each version checked in, without running 'prcs info'.
+PRCS appends a pair of lines to the 'prcs_log' file of the project for each
+check-in, and only the lines appended since the last change are parsed.
+
+Changes are detected with inotify where it is available through 'ctypes', or
+by polling the status of the log file otherwise.
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import re
+from datetime import datetime
+from email.utils import parsedate
+from os import close, read, stat
+from os.path import join
+from select import select
+from threading import Event, Lock, Thread
+from . import _repository
+
+try:
+    from queue import Empty, Queue
+except ImportError:
+    # Python 2.7
+    from Queue import Empty, Queue
+
+# Pattern for log lines, which are written as 'log: <user> <pid> <host>
+# <date> <PRCS version>: <message>'.
+_LOG_PATTERN = re.compile(
+    r"^log: (\S+) (\d+) \S+ (\w{3}, .*? [-+]\d{4}) \S+: (.*)$")
+
+_CHECKIN_PATTERN = re.compile(r"^Checking in project version (\S+)\.$")
+
+_FINISHED_MESSAGE = "Finished checking in."
+
+# Default interval in seconds between polls when inotify is not available.
+DEFAULT_INTERVAL = 0.2
+
+# Flags for inotify from <sys/inotify.h>.
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+# Marker put into queues when the watcher stops.
+_STOP = object()
+
+_logger = logging.getLogger(__name__)
+
+def _inotify(path):
+    """
+    Return an inotify descriptor watching a directory, or None if inotify is
+    not available.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return None
+    mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    if add_watch(fd, path.encode(), mask) < 0:
+        close(fd)
+        return None
+    return fd
+
+class PrcsWatcher:
+    """
+    Watcher of new versions of a project.
+
+    Each record has the same form as the values returned by
+    'PrcsProject.versions'.  Records are passed to the callbacks on the
+    watcher thread, and queued for iteration from the first call to
+    '__iter__' or '__aiter__'.  An exception raised by a callback is logged
+    and does not stop the watcher.
+    """
+
+    def __init__(self, name, callback=None, interval=DEFAULT_INTERVAL,
+                 use_inotify=True):
+        """
+        Construct a watcher for a project.
+        """
+        self._name = name
+        self._directory = join(_repository(), name)
+        self._callbacks = []
+        if callback is not None:
+            self._callbacks.append(callback)
+        self._interval = interval
+        self._use_inotify = use_inotify
+        self._offset = 0
+        self._partial = b""
+        # Maps process ids to versions being checked in.
+        self._checkins = {}
+        self._queue = None
+        # Pairs of event loops and the callbacks of asynchronous iterations
+        # waiting on them.
+        self._waiters = []
+        self._lock = Lock()
+        self._stopped = Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add_callback(self, callback):
+        """
+        Add a callback which is called with each new record.
+        """
+        self._callbacks.append(callback)
+
+    def start(self):
+        """
+        Start watching from the current end of the log.
+        """
+        if self._thread is not None:
+            raise RuntimeError("watcher already started")
+        try:
+            self._offset = stat(join(self._directory, "prcs_log")).st_size
+        except EnvironmentError:
+            self._offset = 0
+        # The watch is added before returning so that no change is missed.
+        fd = None
+        if self._use_inotify:
+            fd = _inotify(self._directory)
+        self._thread = Thread(target=self._run, args=(fd,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop watching and end any iteration.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            if self._queue is not None:
+                self._queue.put(_STOP)
+                self._wakeup()
+
+    def _run(self, fd):
+        try:
+            while not self._stopped.is_set():
+                if fd is not None:
+                    # The timeout lets the thread notice 'stop' calls.
+                    ready = select([fd], [], [], self._interval)[0]
+                    if not ready:
+                        continue
+                    self._drain(fd)
+                else:
+                    self._stopped.wait(self._interval)
+                self.poll()
+        finally:
+            if fd is not None:
+                close(fd)
+
+    @staticmethod
+    def _drain(fd):
+        """
+        Discard the pending inotify events.
+        """
+        while True:
+            try:
+                if not read(fd, 4096):
+                    return
+            except OSError as error:
+                if error.errno == errno.EAGAIN:
+                    return
+                raise
+
+    def poll(self):
+        """
+        Parse the lines appended to the log and deliver new records.
+
+        This method is called on the watcher thread, but it can also be called
+        directly on a watcher which is not started.
+        """
+        name = join(self._directory, "prcs_log")
+        try:
+            size = stat(name).st_size
+        except EnvironmentError:
+            return
+        if size < self._offset:
+            # The log was truncated, so we only follow it from its new end.
+            self._offset = size
+            self._partial = b""
+        if size == self._offset:
+            return
+        with open(name, "rb") as stream:
+            stream.seek(self._offset)
+            data = self._partial + stream.read(size - self._offset)
+        self._offset = size
+        lines = data.split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            record = self._parseline(line.decode("utf-8", "replace"))
+            if record is not None:
+                self._deliver(record)
+
+    def _parseline(self, line):
+        """
+        Return the record for a log line that completes a check-in.
+        """
+        match = _LOG_PATTERN.match(line)
+        if match is None:
+            return None
+        author, pid, date, message = match.groups()
+        checkin = _CHECKIN_PATTERN.match(message)
+        if checkin is not None:
+            self._checkins[pid] = checkin.group(1)
+        elif message == _FINISHED_MESSAGE and pid in self._checkins:
+            # Note: the dates are recorded in local times.
+            return {
+                "project": self._name,
+                "id": self._checkins.pop(pid),
+                "date": datetime(*parsedate(date)[0:6]),
+                "author": author,
+                "deleted": False,
+            }
+        return None
+
+    def _deliver(self, record):
+        for callback in self._callbacks:
+            try:
+                callback(record)
+            except Exception:
+                # A failing callback must not end the watcher thread.
+                _logger.exception("error in a watcher callback")
+        with self._lock:
+            if self._queue is not None:
+                self._queue.put(record)
+                self._wakeup()
+
+    def _wakeup(self):
+        """
+        Wake up the asynchronous iterations waiting on any event loop.
+
+        This method must be called with the lock held.
+        """
+        waiters, self._waiters = self._waiters, []
+        for loop, callback in waiters:
+            try:
+                loop.call_soon_threadsafe(callback)
+            except RuntimeError:
+                # The event loop is closed.
+                pass
+
+    def _getqueue(self):
+        with self._lock:
+            if self._queue is None:
+                self._queue = Queue()
+                if self._stopped.is_set():
+                    self._queue.put(_STOP)
+            return self._queue
+
+    def __iter__(self):
+        return self._iterate(self._getqueue())
+
+    @staticmethod
+    def _iterate(queue):
+        while True:
+            record = queue.get()
+            if record is _STOP:
+                queue.put(_STOP)
+                return
+            yield record
+
+    def __aiter__(self):
+        self._getqueue()
+        return self
+
+    def __anext__(self):
+        """
+        Return an awaitable for the next record.
+
+        The record is waited for on the event loop, which is woken up by the
+        watcher thread, so cancelling the wait leaves no thread behind.
+        """
+        import asyncio
+        queue = self._getqueue()
+        loop = asyncio.get_event_loop()
+        result = loop.create_future()
+
+        def poll():
+            if result.cancelled():
+                return
+            # The queue is checked with the lock held so that no wakeup is
+            # missed.
+            with self._lock:
+                try:
+                    record = queue.get_nowait()
+                except Empty:
+                    self._waiters.append((loop, poll))
+                    return
+            if record is _STOP:
+                queue.put(_STOP)
+                result.set_exception(StopAsyncIteration())
+            else:
+                result.set_result(record)
+
+        def discard(future):
+            if future.cancelled():
+                with self._lock:
+                    if (loop, poll) in self._waiters:
+                        self._waiters.remove((loop, poll))
+
+        result.add_done_callback(discard)
+        poll()
+        return result
@@ -28,3 +28,17 @@ test suite package
 from __future__ import absolute_import, unicode_literals
 
 from .test_version import *
+from .test_descriptor import *
+from .test_binary import *
+from .test_rcs import *
+from .test_service import *
+from .test_server import *
+from .test_watch import *
+from .test_repository import *
+from .test_stats import *
+from .test_pathindex import *
+from .test_editor import *
+from .test_import import *
+from .test_sexpdata import *
+from .test_merge import *
+from .test_cache import *
@@ -0,0 +1,106 @@
+# fixtures.py - shared fixtures for the unit tests
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+shared fixtures for the unit tests
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from os import environ
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import TestCase
+from prcslib import PrcsVersionDescriptor
+
+try:
+    from concurrent import futures
+except ImportError:
+    # Python 2.7
+    futures = None
+
+def _versionatoms(version):
+    """
+    Return the major and minor parts of a version as descriptor text.
+    """
+    return "%s %s" % tuple(version.rsplit(".", 1))
+
+def makedescriptor(files=(), version=None, parent=None, merge_parents=(),
+                   message=None, extra=""):
+    """
+    Return a descriptor parsed from content made of the given parts.
+
+    Each file is either a tuple of a name, a file id, a revision and an
+    optional mode string, which defaults to "644", or the text of an entry.
+    Versions are strings such as "0.1", and the parent "-*-.-*-" means none.
+    'extra' is appended to the content as it is.
+    """
+    lines = []
+    if version is not None:
+        lines.append("(Project-Version testproject %s)"
+                     % _versionatoms(version))
+    if parent is not None:
+        lines.append("(Parent-Version testproject %s)"
+                     % _versionatoms(parent))
+    if message is not None:
+        lines.append('(Version-Log "%s")' % message)
+    lines.append("(Merge-Parents %s)" % " ".join(
+        "(%s complete)" % i for i in merge_parents))
+    lines.append("(Files")
+    for entry in files:
+        if isinstance(entry, tuple):
+            name, file_id, revision = entry[:3]
+            mode = entry[3] if len(entry) > 3 else "644"
+            entry = "(%s (%s %s %s))" % (name, file_id, revision, mode)
+        lines.append("  " + entry)
+    lines.append(")")
+    content = "\n".join(lines) + "\n" + extra
+    descriptor = PrcsVersionDescriptor()
+    # pylint: disable=protected-access
+    descriptor._properties, descriptor._files = \
+        descriptor._parsecontent(content.encode("utf-8"))
+    return descriptor
+
+class RepositoryTestCase(TestCase):
+    """
+    Base test case class which points 'PRCS_REPOSITORY' to an empty temporary
+    directory during each test.
+    """
+
+    def setUp(self):
+        """
+        Set up the temporary repository.
+        """
+        self._repository = mkdtemp()
+        self._environ = environ.get("PRCS_REPOSITORY")
+        environ["PRCS_REPOSITORY"] = self._repository
+
+    def tearDown(self):
+        """
+        Restore 'PRCS_REPOSITORY' and remove the temporary repository.
+        """
+        if self._environ is None:
+            del environ["PRCS_REPOSITORY"]
+        else:
+            environ["PRCS_REPOSITORY"] = self._environ
+        rmtree(self._repository)
@@ -0,0 +1,59 @@
+# importtime.py - benchmark of the import time of prcslib
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+benchmark of the import time of the 'prcslib' package
+
+Run 'python test/importtime.py' from the top directory to print the median
+time of 'import prcslib' in fresh interpreters.
+"""
+
+from __future__ import absolute_import, print_function
+
+import sys
+from subprocess import check_output
+
+# Number of interpreters to start.
+RUNS = 21
+
+SCRIPT = """
+import time
+start = time.time()
+import prcslib
+print(time.time() - start)
+"""
+
+def main():
+    """
+    Measure and print the import time.
+    """
+    times = sorted(
+        float(check_output([sys.executable, "-c", SCRIPT]))
+        for __ in range(RUNS)
+    )
+    print("import prcslib: %.2f ms (median of %d)"
+          % (times[RUNS // 2] * 1000, RUNS))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
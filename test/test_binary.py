@@ -0,0 +1,108 @@
+# test_binary.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.binary' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from io import BytesIO
+from os import close, unlink
+from tempfile import mkstemp
+from unittest import TestCase
+from prcslib import PrcsVersionDescriptor, binary
+
+# Version descriptor for tests.
+DESCRIPTOR = """;; -*- Prcs -*-
+(Project-Version testproject 0 3)
+(Parent-Version testproject 0 2)
+(Version-Log "Third check-in\\n\\u00e9t\\u00e9")
+(Project-Keywords [a b] (c t))
+(Files
+  (file1 (testproject/0_file1 1.2 664))
+  (file2 (testproject/1_file2 1.1 644) :no-keywords)
+  (link1 (file1) :symlink)
+)
+(Merge-Parents (0.1 complete))
+"""
+
+class BinaryTests(TestCase):
+    """
+    Test case class for the 'prcslib.binary' module.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        fd, name = mkstemp(suffix=".prj")
+        close(fd)
+        try:
+            with open(name, "wb") as stream:
+                stream.write(DESCRIPTOR.encode("utf-8"))
+            self._descriptor = PrcsVersionDescriptor(name)
+        finally:
+            unlink(name)
+
+    def test_roundtrip(self):
+        """
+        Test loading dumped data.
+        """
+        stream = BytesIO()
+        binary.dump(self._descriptor, stream)
+        data = stream.getvalue()
+        self.assertTrue(data.startswith(binary.MAGIC))
+
+        descriptor = binary.load(BytesIO(data))
+        self.assertEqual("0.3", descriptor.version())
+        self.assertEqual("0.2", descriptor.parent())
+        self.assertEqual(["0.1"], descriptor.mergeparents())
+        self.assertEqual(self._descriptor.message(), descriptor.message())
+        self.assertEqual(self._descriptor.files(), descriptor.files())
+        self.assertEqual(data, binary.dumps(descriptor))
+
+    def test_errors(self):
+        """
+        Test loading broken data.
+        """
+        data = binary.dumps(self._descriptor)
+        self.assertRaises(binary.PrcsFormatError, binary.loads, b"PRCS")
+        self.assertRaises(binary.PrcsFormatError, binary.loads, data[:-3])
+
+    def test_entry_order(self):
+        """
+        Test that file entries of every form keep their order.
+        """
+        descriptor = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        descriptor._files = [
+            ("link0", ["file1"], [":symlink"]),
+            ("file1", ["testproject/0_file1", "1.1", "644"], []),
+            ("file2", ["testproject/1_file2", "1.1", "644"], []),
+            ("dir", [], [":directory"]),
+            ("file3", ["testproject/2_file3", "1.1", "644"], []),
+            ("link4", ["file3"], [":symlink"]),
+        ]
+        loaded = binary.loads(binary.dumps(descriptor))
+        self.assertEqual(descriptor._files, loaded._files)
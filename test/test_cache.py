@@ -0,0 +1,200 @@
+# test_cache.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for memory-bounded descriptor processing
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from os import listdir
+from unittest import TestCase, skipIf
+from prcslib import PrcsProject
+from prcslib.cache import DescriptorCache, DescriptorList, estimatesize
+from prcslib.sexpdata import BufferSymbol
+from test.fixtures import futures, makedescriptor
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    # Python 2.7
+    patch = None
+
+def _descriptor(minor):
+    """
+    Return a descriptor for version '0.<minor>' with a few properties which
+    compact descriptors drop.
+    """
+    return makedescriptor([
+        ("file1", "testproject/0_file1", "1.%d" % minor, "664"),
+        "(dir/file2 (testproject/1_file2 1.1 755) :no-keywords)",
+        "(link1 (file1) :symlink)",
+    ], version="0.%d" % minor, parent="0.%d" % (minor - 1),
+        message="Check-in %d" % minor,
+        extra='(Checkin-Time "Wed, 01 Apr 2020 12:00:00 +0900")\n'
+        '(Populate-Ignore ())\n')
+
+class CompactTests(TestCase):
+    """
+    Test case class for 'PrcsVersionDescriptor.compact'.
+    """
+
+    def test_compact(self):
+        """
+        Test that compact descriptors keep what their methods return.
+        """
+        descriptor = _descriptor(2)
+        compact = descriptor.compact()
+        self.assertEqual("0.2", compact.version())
+        self.assertEqual("0.1", compact.parent())
+        self.assertEqual([], compact.mergeparents())
+        self.assertEqual("Check-in 2", compact.message())
+        self.assertEqual(descriptor.checkintime(), compact.checkintime())
+        self.assertEqual(descriptor.files(), compact.files())
+        # pylint: disable=protected-access
+        self.assertFalse("Populate-Ignore" in compact._properties)
+        for name, info, options in compact._files:
+            for atom in [name] + info + options:
+                self.assertEqual(type(""), type(atom))
+        for value in compact._properties.values():
+            for atom in value:
+                self.assertFalse(isinstance(atom, BufferSymbol))
+
+class DescriptorCacheTests(TestCase):
+    """
+    Test case class for 'DescriptorCache'.
+    """
+
+    def setUp(self):
+        """
+        Set up a cache which holds two descriptors in memory.
+        """
+        self._size = estimatesize(_descriptor(1).compact())
+        self._cache = DescriptorCache(2 * self._size)
+
+    def tearDown(self):
+        """
+        Tear down the test fixture.
+        """
+        self._cache.close()
+
+    def test_spill(self):
+        """
+        Test that the least recently used descriptors are spilled and loaded
+        again.
+        """
+        cache = self._cache
+        for minor in range(1, 5):
+            cache[minor] = _descriptor(minor).compact()
+        self.assertEqual(4, len(cache))
+        self.assertEqual(2 * self._size, cache.memoryusage())
+        self.assertEqual(2, cache.spilled())
+        self.assertEqual("Check-in 1", cache[1].message())
+        self.assertEqual(2 * self._size, cache.memoryusage())
+        self.assertEqual("Check-in 3", cache[3].message())
+        self.assertEqual(_descriptor(2).files(), cache.get(2).files())
+        self.assertEqual(None, cache.get(5))
+        self.assertRaises(KeyError, lambda: cache[5])
+
+    def test_pop(self):
+        """
+        Test the 'pop' method on spilled descriptors.
+        """
+        cache = self._cache
+        for minor in range(1, 5):
+            cache[minor] = _descriptor(minor).compact()
+        # pylint: disable=protected-access
+        directory = cache._tempdir
+        self.assertEqual(2, len(listdir(directory)))
+        self.assertEqual("0.1", cache.pop(1).version())
+        self.assertEqual(1, len(listdir(directory)))
+        self.assertFalse(1 in cache)
+        self.assertEqual(None, cache.pop(1))
+        cache.close()
+        self.assertEqual(0, len(cache))
+
+    def test_list(self):
+        """
+        Test 'DescriptorList' over spilled descriptors.
+        """
+        for minor in range(1, 6):
+            self._cache[minor - 1] = _descriptor(minor).compact()
+        descriptors = DescriptorList(self._cache, 5)
+        self.assertEqual(5, len(descriptors))
+        self.assertEqual(
+            ["0.%d" % i for i in range(1, 6)],
+            [str(i.version()) for i in descriptors])
+        self.assertEqual("0.5", descriptors[-1].version())
+        self.assertEqual(
+            ["0.2", "0.3"], [str(i.version()) for i in descriptors[1:3]])
+        self.assertRaises(IndexError, lambda: descriptors[5])
+
+class BoundedHistoryTests(TestCase):
+    """
+    Test case class for 'PrcsProject.iter_history' with a memory limit.
+    """
+
+    def setUp(self):
+        """
+        Set up a project whose versions are dated before their parents.
+        """
+        self._project = PrcsProject("testproject", memory_limit=0)
+        records = {}
+        for minor in range(1, 6):
+            records["0.%d" % minor] = {
+                "id": "0.%d" % minor, "deleted": False, "date": 10 - minor,
+            }
+        self._project.versions = lambda: records
+        # pylint: disable=protected-access
+        self._project._fetchdescriptor = lambda version: _descriptor(
+            int(version.split(".")[1]))
+
+    @skipIf(futures is None, "concurrent.futures is not available")
+    def test_iter_history(self):
+        """
+        Test that waiting descriptors are spilled and generated in order.
+        """
+        history = list(self._project.iter_history(order="topo", prefetch=2))
+        self.assertEqual(
+            ["0.%d" % i for i in range(1, 6)],
+            [i[0]["id"] for i in history])
+        for record, descriptor in history:
+            self.assertEqual(record["id"], descriptor.version())
+            # pylint: disable=protected-access
+            self.assertFalse("Populate-Ignore" in descriptor._properties)
+
+    @skipIf(futures is None or patch is None,
+            "concurrent.futures or unittest.mock is not available")
+    def test_early_stop(self):
+        """
+        Test that the spilled descriptors are removed when the consumer stops
+        early.
+        """
+        with patch.object(
+                DescriptorCache, "close", autospec=True,
+                side_effect=DescriptorCache.close) as close:
+            history = self._project.iter_history(order="topo", prefetch=8)
+            self.assertEqual("0.1", next(history)[0]["id"])
+            self.assertFalse(close.called)
+            history.close()
+            self.assertTrue(close.called)
@@ -0,0 +1,174 @@
+# test_descriptor.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'PrcsVersionDescriptor' class
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from os import close, unlink
+from tempfile import mkstemp
+from unittest import TestCase
+from prcslib import PrcsVersionDescriptor, parsedescriptors, sexpdata
+
+# Version descriptor for tests.
+DESCRIPTOR = """;; -*- Prcs -*-
+(Created-By-Prcs-Version 1 3 4)
+(Project-Description "")
+(Project-Version testproject 0 2)
+(Parent-Version testproject 0 1)
+(Version-Log "Second check-in")
+(New-Version-Log "")
+(Checkin-Time "Wed, 01 Apr 2020 12:00:00 +0900")
+(Checkin-Login kazssym)
+(Populate-Ignore ())
+(Project-Keywords)
+(Files
+;; This is a comment.  Fill in files here.
+;; For example:  (prcs/checkout.cc ())
+  (file1 (testproject/0_file1 1.2 664))
+  (dir/file2 (testproject/1_file2 1.1 755) :no-keywords)
+  (link1 (file1) :symlink)
+)
+(Merge-Parents (1.1 complete file1 :no-keywords))
+(New-Merge-Parents)
+"""
+
+class DescriptorTests(TestCase):
+    """
+    Test case class for the 'PrcsVersionDescriptor' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        fd, name = mkstemp(suffix=".prj")
+        close(fd)
+        try:
+            with open(name, "w") as stream:
+                stream.write(DESCRIPTOR)
+            self._descriptor = PrcsVersionDescriptor(name)
+        finally:
+            unlink(name)
+
+    def test_version(self):
+        """
+        Test the 'version' and 'parent' methods.
+        """
+        self.assertEqual("0.2", self._descriptor.version())
+        self.assertEqual("0.1", self._descriptor.parent())
+
+    def test_mergeparents(self):
+        """
+        Test the 'mergeparents' method.
+        """
+        self.assertEqual(["1.1"], self._descriptor.mergeparents())
+
+    def test_message(self):
+        """
+        Test the 'message' method.
+        """
+        self.assertEqual("Second check-in", self._descriptor.message())
+
+    def test_checkintime(self):
+        """
+        Test the 'checkintime' method.
+        """
+        self.assertEqual(1585710000, self._descriptor.checkintime())
+        self.assertEqual(None, PrcsVersionDescriptor().checkintime())
+
+    def test_files(self):
+        """
+        Test the 'files' method.
+        """
+        files = self._descriptor.files()
+        self.assertEqual(3, len(files))
+        self.assertEqual({
+            "id": "testproject/0_file1",
+            "revision": "1.2",
+            "mode": 0o664,
+        }, files["file1"])
+        self.assertEqual(0o755, files["dir/file2"]["mode"])
+        self.assertEqual({"symlink": "file1"}, files["link1"])
+
+    def test_directory(self):
+        """
+        Test the 'files' method on directory entries.
+        """
+        descriptor = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        descriptor._properties, descriptor._files = descriptor._parsecontent(
+            b"(Files (empty () :directory) (file1 (p/0_file1 1.1 644)))")
+        self.assertEqual({
+            "empty": {"directory": True},
+            "file1": {"id": "p/0_file1", "revision": "1.1", "mode": 0o644},
+        }, descriptor.files())
+
+    def test_entries(self):
+        """
+        Test that common file entries are parsed as the others are.
+        """
+        content = b"""(Files
+  (a (p/0_a 1.1 644)) (b () :directory)
+  (c (p/1_c 1.2 755) :no-keywords :x);; comment
+  (d\\ e (p/2_d 1.1 644)) ("f" (p/3_f 1.1 644)) (nil (p/4 t 644))
+  (g (p/5_g 1.1 644)))
+(Merge-Parents (Files (h (p/6_h 1.1 644))))
+"""
+        # pylint: disable=protected-access
+        properties, files = PrcsVersionDescriptor._parsecontent(content)
+        symbol = sexpdata.Symbol
+        self.assertEqual(
+            [symbol("a"), symbol("b"), symbol("c"), symbol("d e"), "f", [],
+             symbol("g")],
+            [name for name, __, __ in files])
+        self.assertEqual(
+            (properties, files),
+            PrcsVersionDescriptor._parsedescriptor(
+                sexpdata.iterparse_buffer(content, symbol_table={})))
+        # Revisions and options are shared.
+        self.assertTrue(files[0][1][1] is files[4][1][1])
+
+    def test_empty(self):
+        """
+        Test reading an empty descriptor file.
+        """
+        fd, name = mkstemp(suffix=".prj")
+        close(fd)
+        try:
+            descriptor = PrcsVersionDescriptor(name)
+        finally:
+            unlink(name)
+        self.assertEqual({}, descriptor.files())
+
+    def test_parsedescriptors(self):
+        """
+        Test the 'parsedescriptors' function.
+        """
+        descriptors = parsedescriptors([DESCRIPTOR.encode("utf-8")] * 2, 2)
+        self.assertEqual(2, len(descriptors))
+        for descriptor in descriptors:
+            self.assertEqual("0.2", descriptor.version())
+            self.assertEqual(self._descriptor.files(), descriptor.files())
@@ -0,0 +1,108 @@
+# test_editor.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'PrcsDescriptorEditor' class
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from io import BytesIO
+from unittest import TestCase
+from prcslib import PrcsVersion
+from prcslib.editor import PrcsDescriptorEditor
+from prcslib.sexpdata import Symbol
+from test.test_descriptor import DESCRIPTOR
+
+class EditorTests(TestCase):
+    """
+    Test case class for the 'PrcsDescriptorEditor' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        self._content = DESCRIPTOR.encode()
+        self._editor = PrcsDescriptorEditor(self._content)
+
+    def test_unchanged(self):
+        """
+        Test writing without edits.
+        """
+        stream = BytesIO()
+        self._editor.write(stream)
+        self.assertEqual(self._content, stream.getvalue())
+
+    def test_properties(self):
+        """
+        Test editing properties.
+        """
+        self._editor.setversionlog('Third "check-in"\nwith two lines')
+        self._editor.setmergeparents([
+            [Symbol("0.3"), Symbol("complete")],
+        ])
+        self._editor.setproperty("New-Property", Symbol("value"))
+        self.assertEqual(
+            DESCRIPTOR.replace(
+                '(Version-Log "Second check-in")',
+                '(Version-Log "Third \\"check-in\\"\nwith two lines")')
+            .replace(
+                "(Merge-Parents (1.1 complete file1 :no-keywords))",
+                "(Merge-Parents (0.3 complete))")
+            + "(New-Property value)\n",
+            self._editor.getvalue().decode())
+        descriptor = self._editor.descriptor()
+        self.assertEqual(
+            'Third "check-in"\nwith two lines', descriptor.message())
+        self.assertEqual([PrcsVersion("0.3")], descriptor.mergeparents())
+
+    def test_files(self):
+        """
+        Test editing the Files section.
+        """
+        self._editor.setfile("file1", ["testproject/0_file1", "1.3", "664"])
+        self._editor.removefile("dir/file2")
+        self._editor.setfile("new file", [])
+        self._editor.setfile("link2", ["file1"], [":symlink"])
+        self.assertRaises(KeyError, self._editor.removefile, "file3")
+        self.assertEqual(
+            DESCRIPTOR.replace(
+                "(file1 (testproject/0_file1 1.2 664))",
+                "(file1 (testproject/0_file1 1.3 664))")
+            .replace(
+                "  (dir/file2 (testproject/1_file2 1.1 755) :no-keywords)\n",
+                "")
+            .replace(
+                "  (link1 (file1) :symlink)\n",
+                "  (link1 (file1) :symlink)\n"
+                "  (link2 (file1) :symlink)\n"
+                '  ("new file" ())\n'),
+            self._editor.getvalue().decode())
+        self._editor.removefile("new file")
+        self.assertEqual(
+            {"file1": {"id": "testproject/0_file1", "revision": "1.3",
+                       "mode": 0o664},
+             "link1": {"symlink": "file1"},
+             "link2": {"symlink": "file1"}},
+            self._editor.descriptor().files())
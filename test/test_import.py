@@ -0,0 +1,69 @@
+# test_import.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the import cost of the 'prcslib' package
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import sys
+from subprocess import check_output
+from unittest import TestCase, skipIf
+
+# Modules which 'import prcslib' must not import.
+HEAVY_MODULES = [
+    "re", "subprocess", "datetime", "email.utils", "tempfile", "shutil",
+    "collections", "threading", "prcslib.sexpdata",
+]
+
+class ImportTests(TestCase):
+    """
+    Test case class for importing the 'prcslib' package.
+    """
+
+    def test_lazy_modules(self):
+        """
+        Test that heavy modules are imported only on first use.
+        """
+        script = (
+            "import sys\n"
+            "before = set(sys.modules)\n"
+            "import prcslib\n"
+            "print(' '.join(sorted(set(sys.modules) - before)))\n")
+        output = check_output([sys.executable, "-c", script])
+        loaded = output.decode().split()
+        self.assertEqual(
+            [], [name for name in HEAVY_MODULES if name in loaded])
+
+    @skipIf(sys.version_info < (3, 7), "module __getattr__ is not supported")
+    def test_submodules(self):
+        """
+        Test that submodules are imported when they are first accessed.
+        """
+        script = (
+            "import prcslib\n"
+            "print(prcslib.rcs.__name__, prcslib.sexpdata.__name__)\n")
+        output = check_output([sys.executable, "-c", script])
+        self.assertEqual(
+            "prcslib.rcs prcslib.sexpdata", output.decode().strip())
@@ -0,0 +1,90 @@
+# test_merge.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for merge planning
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from unittest import TestCase
+from prcslib import PrcsProject
+from test.fixtures import makedescriptor
+
+class MergeTests(TestCase):
+    """
+    Test case class for 'PrcsProject.plan_merge'.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        self._project = PrcsProject("testproject")
+        # pylint: disable=protected-access
+        self._project._descriptors.update({
+            "0.1": makedescriptor(parent="-*-.-*-", files=[
+                ("a", "p/0_a", "1.1"), ("b", "p/1_b", "1.1"),
+                ("c", "p/2_c", "1.1"), ("d", "p/3_d", "1.1"),
+                ("e", "p/4_e", "1.1"),
+            ]),
+            "0.2": makedescriptor(parent="0.1", files=[
+                ("a", "p/0_a", "1.2"), ("b", "p/1_b", "1.1"),
+                ("c", "p/2_c", "1.2"), ("e", "p/4_e", "1.1"),
+                ("f", "p/5_f", "1.1"),
+            ]),
+            "1.1": makedescriptor(parent="0.1", files=[
+                ("a", "p/0_a", "1.1"), ("b2", "p/1_b", "1.1"),
+                ("c", "p/2_c", "1.3"), ("d", "p/3_d", "1.1"),
+                ("g", "p/6_g", "1.1"),
+            ]),
+            "0.3": makedescriptor(parent="0.2", merge_parents=["1.1"]),
+            "1.2": makedescriptor(parent="1.1"),
+        })
+
+    def test_mergebase(self):
+        """
+        Test the 'mergebase' method.
+        """
+        self.assertEqual("0.1", self._project.mergebase("0.2", "1.1"))
+        self.assertEqual("1.1", self._project.mergebase("0.3", "1.2"))
+        self.assertEqual("0.2", self._project.mergebase("0.3", "0.2"))
+
+    def test_plan_merge(self):
+        """
+        Test the 'plan_merge' method.
+        """
+        plan = self._project.plan_merge("0.2", "1.1")
+        self.assertEqual("0.1", plan["base"])
+        self.assertEqual(
+            {"ours": ["a", "d", "f"], "theirs": ["b2"], "conflict": ["c"],
+             "add": ["g"], "delete": ["e"]},
+            dict((kind, [item["name"] for item in plan[kind]])
+                 for kind in ["ours", "theirs", "conflict", "add", "delete"]))
+        self.assertEqual({
+            "name": "b2",
+            "base": ("b", {"id": "p/1_b", "revision": "1.1", "mode": 0o644}),
+            "ours": ("b", {"id": "p/1_b", "revision": "1.1", "mode": 0o644}),
+            "theirs": ("b2",
+                       {"id": "p/1_b", "revision": "1.1", "mode": 0o644}),
+        }, plan["theirs"][0])
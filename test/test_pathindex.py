@@ -0,0 +1,139 @@
+# test_pathindex.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.pathindex' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from unittest import TestCase
+from prcslib import PrcsVersionDescriptor
+from prcslib.pathindex import PathIndex
+
+NAMES = [
+    "Makefile",
+    "lib/net.h",
+    "lib/net/http.c",
+    "lib/net/http.h",
+    "lib/netutil/ip.c",
+    "lib/util.h",
+    "src/main.c",
+]
+
+class PathIndexTests(TestCase):
+    """
+    Test case class for the 'PathIndex' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        self._index = PathIndex(reversed(NAMES))
+
+    def test_files_under(self):
+        """
+        Test the 'files_under' method.
+        """
+        self.assertEqual(
+            ["lib/net/http.c", "lib/net/http.h"],
+            self._index.files_under("lib/net/"))
+        self.assertEqual(
+            ["lib/net/http.c", "lib/net/http.h"],
+            self._index.files_under("lib/net"))
+        self.assertEqual([], self._index.files_under("doc"))
+        self.assertEqual(NAMES, self._index.files_under(""))
+
+    def test_glob(self):
+        """
+        Test the 'glob' method.
+        """
+        self.assertEqual(
+            ["lib/net.h", "lib/net/http.h", "lib/util.h"],
+            self._index.glob("*.h"))
+        self.assertEqual(
+            ["lib/net/http.c", "lib/netutil/ip.c"],
+            self._index.glob("lib/net*.c"))
+        self.assertEqual(["src/main.c"], self._index.glob("src/ma?n.[ch]"))
+        self.assertEqual(["Makefile"], self._index.glob("Makefile"))
+        self.assertEqual([], self._index.glob("Make"))
+
+    def test_listdir(self):
+        """
+        Test the 'listdir' method.
+        """
+        self.assertEqual(["Makefile", "lib/", "src/"], self._index.listdir())
+        self.assertEqual(
+            ["net.h", "net/", "netutil/", "util.h"],
+            self._index.listdir("lib/"))
+        self.assertEqual(
+            ["http.c", "http.h"], self._index.listdir("lib/net"))
+        self.assertRaises(KeyError, self._index.listdir, "doc")
+
+    def test_directories(self):
+        """
+        Test the 'listdir' method with directory entries.
+        """
+        index = PathIndex(NAMES + ["doc", "lib", "lib/net"],
+                          ["doc", "lib", "lib/net"])
+        self.assertEqual(
+            ["Makefile", "doc/", "lib/", "src/"], index.listdir())
+        self.assertEqual([], index.listdir("doc"))
+        self.assertEqual(
+            ["net.h", "net/", "netutil/", "util.h"], index.listdir("lib"))
+        self.assertEqual(["http.c", "http.h"], index.listdir("lib/net"))
+
+    def test_descriptor(self):
+        """
+        Test the path queries of 'PrcsVersionDescriptor'.
+        """
+        descriptor = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        descriptor._files = [
+            (name, ["p/%d_file" % i, "1.1", "644"], [])
+            for i, name in enumerate(NAMES)
+        ]
+        self.assertEqual(
+            {"src/main.c": {"id": "p/6_file", "revision": "1.1",
+                            "mode": 0o644}},
+            descriptor.files_under("src"))
+        self.assertEqual(
+            ["lib/net.h", "lib/net/http.h", "lib/util.h"],
+            sorted(descriptor.glob("lib/*[a-z].h")))
+        self.assertEqual(["ip.c"], descriptor.listdir("lib/netutil"))
+
+    def test_descriptor_directories(self):
+        """
+        Test 'PrcsVersionDescriptor.listdir' with directory entries.
+        """
+        descriptor = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        descriptor._files = [
+            ("empty", [], [":directory"]),
+            ("sub", [], [":directory"]),
+            ("sub/file1", ["p/0_file", "1.1", "644"], []),
+        ]
+        self.assertEqual(["empty/", "sub/"], descriptor.listdir())
+        self.assertEqual([], descriptor.listdir("empty"))
+        self.assertEqual(["file1"], descriptor.listdir("sub"))
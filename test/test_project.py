@@ -27,12 +27,46 @@ unit tests for the 'PrcsProject' class
 
 from __future__ import absolute_import, unicode_literals
 
-from unittest import TestCase
-from prcslib import PrcsProject, PrcsVersionDescriptor
+import sys
+import tarfile
+from datetime import datetime
+from io import BytesIO
+from os import chmod, listdir, lstat, makedirs, readlink, stat
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Lock
+from time import sleep
+from unittest import TestCase, skipIf
+import prcslib
+from prcslib import PrcsProject, PrcsVersionDescriptor, PrcsError, \
+    PrcsCommandError
+from test.fixtures import RepositoryTestCase, futures, makedescriptor
+from test.test_rcs import RCS_FILE
+
+try:
+    import lzma
+except ImportError:
+    # Python 2.7
+    lzma = None
+
+# Compression formats of packages.
+COMPRESSIONS = ["gzip", "bz2"] + (["xz"] if lzma is not None else [])
 
 # PRCS project name for tests.
 PRCS_PROJECT_NAME = "testproject"
 
+# Script which saves its arguments and prints a fixed output of 'prcs info'.
+FAKE_PRCS = """#!/bin/sh
+echo "$@" > "$(dirname "$0")/args"
+cat <<EOF
+testproject 0.1 Tue, 31 Mar 2020 23:21:31 +0900 by kazssym
+testproject 0.2 Wed, 01 Apr 2020 10:00:00 +0900 by alice *DELETED*
+testproject 0.3 Thu, 02 Apr 2020 10:00:00 +0900 by alice
+testproject 0.1.1 Fri, 03 Apr 2020 10:00:00 +0900 by kazssym
+EOF
+"""
+
 class ProjectTests(TestCase):
     """
     Test case class for 'PrcsProject'
@@ -58,3 +92,459 @@ class ProjectTests(TestCase):
         descriptor = self._project.descriptor("0.1")
         self.assertTrue(isinstance(descriptor, PrcsVersionDescriptor))
         self.assertEqual("0.1", descriptor.version())
+
+    @skipIf(futures is None, "concurrent.futures is not available")
+    def test_iter_history(self):
+        """
+        Test the 'iter_history' method.
+        """
+        history = list(self._project.iter_history(order="topo", prefetch=2))
+        self.assertTrue(len(history) >= 1)
+        record, descriptor = history[0]
+        self.assertEqual(record["id"], descriptor.version())
+
+class HistoryTests(TestCase):
+    """
+    Test case class for 'PrcsProject.iter_history' with stub descriptors.
+    """
+
+    def setUp(self):
+        """
+        Set up a project whose descriptors are fetched by a stub which counts
+        the fetches in flight.
+        """
+        self._project = PrcsProject(PRCS_PROJECT_NAME)
+        # The dates are not in the order of the versions.
+        records = {}
+        for minor, day in enumerate([3, 1, 6, 2, 5, 4], 1):
+            records["0.%d" % minor] = {
+                "id": "0.%d" % minor, "deleted": False,
+                "date": datetime(2020, 4, day),
+            }
+        records["0.7"] = {
+            "id": "0.7", "deleted": True, "date": datetime(2020, 4, 7),
+        }
+        self._project.versions = lambda: records
+        self._lock = Lock()
+        self._started = []
+        self._inflight = 0
+        self._peak = 0
+        # pylint: disable=protected-access
+        self._project._fetchdescriptor = self._fetch
+
+    def _fetch(self, version):
+        with self._lock:
+            self._started.append(version)
+            self._inflight += 1
+            self._peak = max(self._peak, self._inflight)
+        sleep(0.02)
+        with self._lock:
+            self._inflight -= 1
+        return PrcsVersionDescriptor()
+
+    @skipIf(futures is None, "concurrent.futures is not available")
+    def test_order(self):
+        """
+        Test that versions are generated in date order without deleted ones.
+        """
+        history = list(self._project.iter_history(prefetch=3))
+        self.assertEqual(
+            ["0.2", "0.4", "0.1", "0.6", "0.5", "0.3"],
+            [record["id"] for record, __ in history])
+        self.assertEqual(3, self._peak)
+
+    @skipIf(futures is None, "concurrent.futures is not available")
+    def test_backpressure(self):
+        """
+        Test that no more fetches are started until the consumer takes the
+        next pair.
+        """
+        history = self._project.iter_history(prefetch=2)
+        self.assertEqual("0.2", next(history)[0]["id"])
+        sleep(0.1)
+        # The first two and the one started before waiting for the first.
+        self.assertEqual(["0.2", "0.4", "0.1"], self._started)
+        self.assertEqual(0, self._inflight)
+        self.assertEqual("0.4", next(history)[0]["id"])
+        sleep(0.1)
+        self.assertEqual(4, len(self._started))
+        history.close()
+        self.assertTrue(self._peak <= 2)
+
+class CachedDescriptorTests(TestCase):
+    """
+    Test case class for the descriptor cache of 'PrcsProject'.
+    """
+
+    def setUp(self):
+        """
+        Set up a project whose descriptors are fetched by a stub.
+        """
+        self._project = PrcsProject(PRCS_PROJECT_NAME)
+        self._latest = 1
+        self._fetched = []
+        # pylint: disable=protected-access
+        self._project._fetchdescriptor = self._fetch
+
+    def _fetch(self, version):
+        self._fetched.append(version)
+        if version is None or "." not in version:
+            version = "0.%d" % self._latest
+        return makedescriptor(version=version)
+
+    def test_selectors(self):
+        """
+        Test that only explicit versions are answered from the cache.
+        """
+        # pylint: disable=protected-access
+        project = self._project
+        self.assertEqual("0.1", str(project._cacheddescriptor("0.1")
+                                    .version()))
+        project._cacheddescriptor("0.1")
+        self.assertEqual(["0.1"], self._fetched)
+        self._latest = 2
+        for selector in ["0", None]:
+            self.assertEqual("0.2", str(project._cacheddescriptor(selector)
+                                        .version()))
+        self.assertEqual(["0.1", "0", None], self._fetched)
+        # The latest versions were cached by their own identifiers.
+        project._cacheddescriptor("0.2")
+        self.assertEqual(3, len(self._fetched))
+
+    def test_bound(self):
+        """
+        Test that the least recently used descriptors are dropped.
+        """
+        # pylint: disable=protected-access
+        project = self._project
+        size = prcslib._DESCRIPTOR_CACHE_SIZE
+        for minor in range(1, size + 1):
+            project._cacheddescriptor("0.%d" % minor)
+        project._cacheddescriptor("0.1")
+        project._cacheddescriptor("0.%d" % (size + 1))
+        self.assertEqual(size, len(project._descriptors))
+        self.assertTrue("0.1" in project._descriptors)
+        self.assertFalse("0.2" in project._descriptors)
+
+class ReadFileTests(RepositoryTestCase):
+    """
+    Test case class for the methods of 'PrcsProject' which read RCS files.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        RepositoryTestCase.setUp(self)
+        makedirs(join(self._repository, "testproject"))
+        with open(join(self._repository, "testproject", "0_file1,v"),
+                  "wb") as stream:
+            stream.write(RCS_FILE)
+        self._project = PrcsProject("testproject")
+        # pylint: disable=protected-access
+        self._project._descriptors.update({
+            "0.1": makedescriptor([
+                ("file1", "testproject/0_file1", "1.1", "664"),
+            ], version="0.1", parent="-*-.-*-"),
+            "0.2": makedescriptor([
+                ("file1", "testproject/0_file1", "1.2", "664"),
+                "(link1 (file1) :symlink)",
+            ], version="0.2", parent="0.1"),
+            "0.3": makedescriptor([
+                ("file1", "testproject/0_file1", "1.3", "664"),
+                ("file2", "testproject/0_file1", "1.1", "664"),
+                ("sub/file1", "testproject/0_file1", "1.2", "644"),
+            ], version="0.3", parent="0.2"),
+            "0.4": makedescriptor([
+                "(empty () :directory)",
+                "(sub () :directory)",
+                ("sub/file1", "testproject/0_file1", "1.2", "644"),
+            ], version="0.4", parent="0.3"),
+        })
+
+    def test_read_file(self):
+        """
+        Test the 'read_file' method.
+        """
+        self.assertEqual(
+            b"one\n2\nthree\nfour\n", self._project.read_file("0.2", "file1"))
+        self.assertRaises(
+            PrcsError, self._project.read_file, "0.2", "link1")
+        self.assertRaises(
+            PrcsError, self._project.read_file, "0.2", "file2")
+
+    def test_diff(self):
+        """
+        Test the 'diff' method.
+        """
+        diff = list(self._project.diff("0.2", "0.3"))
+        self.assertEqual(
+            [("file1", "modified"), ("file2", "added"), ("link1", "removed"),
+             ("sub/file1", "added")],
+            [(i["name"], i["status"]) for i in diff])
+        self.assertEqual([{
+            "old_start": 1, "old_count": 4, "new_start": 1, "new_count": 6,
+            "lines": [
+                ("+", b"zero\n"), (" ", b"one\n"), (" ", b"2\n"),
+                (" ", b"three\n"), (" ", b"four\n"), ("+", b"@at\n"),
+            ],
+        }], diff[0]["hunks"])
+        self.assertEqual(
+            [("+", b"one\n"), ("+", b"two\n"), ("+", b"three\n")],
+            diff[1]["hunks"][0]["lines"])
+        self.assertEqual([], diff[2]["hunks"])
+
+        diff = list(self._project.diff("0.3", "0.2", paths=["sub/"]))
+        self.assertEqual(["sub/file1"], [i["name"] for i in diff])
+        self.assertEqual("removed", diff[0]["status"])
+        self.assertEqual(0, diff[0]["hunks"][0]["new_count"])
+
+    def test_annotate(self):
+        """
+        Test the 'annotate' method.
+        """
+        expected = [
+            ("0.3", b"zero\n"), ("0.1", b"one\n"), ("0.2", b"2\n"),
+            ("0.1", b"three\n"), ("0.2", b"four\n"), ("0.3", b"@at\n"),
+        ]
+        self.assertEqual(expected, self._project.annotate("file1", "0.3"))
+        # This is answered from the annotations made above.
+        self.assertEqual(
+            expected[1:5], self._project.annotate("sub/file1", "0.3"))
+        self.assertEqual(
+            [("0.1", b"one\n"), ("0.1", b"two\n"), ("0.1", b"three\n")],
+            self._project.annotate("file2", "0.3"))
+        self.assertRaises(
+            PrcsError, self._project.annotate, "link1", "0.2")
+
+    def test_annotate_latest(self):
+        """
+        Test the 'annotate' method on the latest version.
+        """
+        # pylint: disable=protected-access
+        latest = self._project._descriptors["0.3"]
+        self._project._fetchdescriptor = lambda version: latest
+        for version in [None, "0"]:
+            self._project._annotations.clear()
+            self.assertEqual(
+                ["0.3", "0.1", "0.2", "0.1", "0.2", "0.3"],
+                [owner for owner, __
+                 in self._project.annotate("file1", version)])
+
+    def test_materialize(self):
+        """
+        Test the 'materialize' method.
+        """
+        root = join(self._repository, "trees")
+        trees = self._project.materialize(["0.1", "0.2", "0.3"], root)
+        self.assertEqual(join(root, "0.3"), trees["0.3"])
+        with open(join(root, "0.3", "sub", "file1"), "rb") as stream:
+            self.assertEqual(b"one\n2\nthree\nfour\n", stream.read())
+        self.assertEqual(0o644, stat(join(root, "0.3", "sub", "file1"))
+                         .st_mode & 0o777)
+        self.assertEqual("file1", readlink(join(root, "0.2", "link1")))
+        # The same revision with the same mode is shared.
+        self.assertEqual(
+            lstat(join(root, "0.1", "file1")).st_ino,
+            lstat(join(root, "0.3", "file2")).st_ino)
+        self.assertNotEqual(
+            lstat(join(root, "0.2", "file1")).st_ino,
+            lstat(join(root, "0.3", "sub", "file1")).st_ino)
+        self.assertRaises(
+            PrcsError, self._project.materialize, ["0.1"], root)
+
+        trees = self._project.materialize(["0.2"], root + "2", link="reflink")
+        with open(join(trees["0.2"], "file1"), "rb") as stream:
+            self.assertEqual(b"one\n2\nthree\nfour\n", stream.read())
+
+        # Directory entries are made even if they are empty.
+        trees = self._project.materialize(["0.4"], root)
+        self.assertEqual([], listdir(join(trees["0.4"], "empty")))
+        self.assertEqual(["file1"], listdir(join(trees["0.4"], "sub")))
+
+    def test_export_tar(self):
+        """
+        Test the 'export_tar' method.
+        """
+        stream = BytesIO()
+        self._project.export_tar("0.3", stream, prefix="testproject/")
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r|") as archive:
+            entries = []
+            for entry in archive:
+                content = None
+                if entry.isfile():
+                    content = archive.extractfile(entry).read()
+                entries.append(
+                    (entry.name, entry.type, entry.mode, content))
+        self.assertEqual([
+            ("testproject/file1", tarfile.REGTYPE, 0o664,
+             b"zero\none\n2\nthree\nfour\n@at\n"),
+            ("testproject/file2", tarfile.REGTYPE, 0o664,
+             b"one\ntwo\nthree\n"),
+            ("testproject/sub", tarfile.DIRTYPE, 0o755, None),
+            ("testproject/sub/file1", tarfile.REGTYPE, 0o644,
+             b"one\n2\nthree\nfour\n"),
+        ], entries)
+
+        stream = BytesIO()
+        self._project.export_tar("0.2", stream, compression="gzip")
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r:gz") as archive:
+            link = archive.getmember("link1")
+            self.assertTrue(link.issym())
+            self.assertEqual("file1", link.linkname)
+
+        # Directory entries are written once, even if they are empty.
+        stream = BytesIO()
+        self._project.export_tar("0.4", stream)
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r|") as archive:
+            self.assertEqual(
+                [("empty", tarfile.DIRTYPE), ("sub", tarfile.DIRTYPE),
+                 ("sub/file1", tarfile.REGTYPE)],
+                [(entry.name, entry.type) for entry in archive])
+
+class VersionFilterTests(TestCase):
+    """
+    Test case class for the filters of 'PrcsProject.iter_versions'.
+    """
+
+    def setUp(self):
+        """
+        Set up a test case with a fake 'prcs' command.
+        """
+        self._tmpdir = mkdtemp()
+        command = join(self._tmpdir, "prcs")
+        with open(command, "w") as stream:
+            stream.write(FAKE_PRCS)
+        chmod(command, 0o755)
+        self._project = PrcsProject(PRCS_PROJECT_NAME)
+        # pylint: disable=protected-access
+        self._project._command = command
+
+    def tearDown(self):
+        """
+        Tear down the test case.
+        """
+        rmtree(self._tmpdir)
+
+    def _args(self):
+        with open(join(self._tmpdir, "args")) as stream:
+            return stream.read().split()
+
+    def test_versions(self):
+        """
+        Test the 'versions' method without filters.
+        """
+        versions = self._project.versions()
+        self.assertEqual(["0.1", "0.1.1", "0.2", "0.3"], sorted(versions))
+        self.assertTrue(versions["0.2"]["deleted"])
+        self.assertEqual(["info", "-f", "testproject"], self._args())
+
+    def test_filters(self):
+        """
+        Test the filters of the 'iter_versions' method.
+        """
+        records = self._project.iter_versions(
+            major="0", since=datetime(2020, 4, 1), include_deleted=False)
+        self.assertEqual(["0.3"], [record["id"] for record in records])
+        self.assertEqual(
+            ["info", "-f", "-r", "0.*", "testproject"], self._args())
+        records = self._project.iter_versions(
+            author="kazssym", until=datetime(2020, 4, 1))
+        self.assertEqual(["0.1"], [record["id"] for record in records])
+
+    def test_error(self):
+        """
+        Test a failing 'prcs info' command.
+        """
+        # pylint: disable=protected-access
+        self._project._command = "false"
+        with self.assertRaises(PrcsCommandError):
+            self._project.versions()
+
+# Script which packages and unpackages a file next to it.
+FAKE_PRCS_PACKAGE = """#!/bin/sh
+cd "$(dirname "$0")"
+case "$1" in
+package)
+    echo "packaging $3" >&2
+    cat package;;
+unpackage)
+    cat > unpackaged
+    test "$4" = testproject;;
+*)
+    exit 1;;
+esac
+"""
+
+class PackageTests(TestCase):
+    """
+    Test case class for 'PrcsProject.export_package' and
+    'PrcsProject.import_package'.
+    """
+
+    def setUp(self):
+        """
+        Set up a test case with a fake 'prcs' command.
+        """
+        self._tmpdir = mkdtemp()
+        command = join(self._tmpdir, "prcs")
+        with open(command, "w") as stream:
+            stream.write(FAKE_PRCS_PACKAGE)
+        chmod(command, 0o755)
+        self._package = bytes(bytearray(range(256))) * 1000
+        with open(join(self._tmpdir, "package"), "wb") as stream:
+            stream.write(self._package)
+        self._project = PrcsProject(PRCS_PROJECT_NAME)
+        # pylint: disable=protected-access
+        self._project._command = command
+
+    def tearDown(self):
+        """
+        Tear down the test case.
+        """
+        rmtree(self._tmpdir)
+
+    def test_package(self):
+        """
+        Test exporting and importing packages with each compression.
+        """
+        for compression in [None] + COMPRESSIONS:
+            stream = BytesIO()
+            self._project.export_package(stream, compression=compression)
+            if compression is None:
+                self.assertEqual(self._package, stream.getvalue())
+            else:
+                self.assertTrue(len(stream.getvalue()) < len(self._package))
+            stream.seek(0)
+            self._project.import_package(stream, compression=compression)
+            with open(join(self._tmpdir, "unpackaged"), "rb") as unpackaged:
+                self.assertEqual(self._package, unpackaged.read())
+
+    @skipIf(sys.version_info < (3,),
+            "Python 2.7 decompressors cannot tell the end of data")
+    def test_corrupt(self):
+        """
+        Test importing corrupt and truncated compressed packages.
+        """
+        for compression in COMPRESSIONS:
+            with self.assertRaises(Exception):
+                self._project.import_package(
+                    BytesIO(b"junk" * 100), compression=compression)
+            stream = BytesIO()
+            self._project.export_package(stream, compression=compression)
+            with self.assertRaises(PrcsError):
+                self._project.import_package(
+                    BytesIO(stream.getvalue()[:-16]),
+                    compression=compression)
+
+    def test_error(self):
+        """
+        Test a failing command.
+        """
+        # pylint: disable=protected-access
+        self._project._name = "other"
+        with self.assertRaises(PrcsCommandError):
+            self._project.import_package(BytesIO(self._package))
@@ -0,0 +1,214 @@
+# test_rcs.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.rcs' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from os import close, unlink
+from tempfile import mkstemp
+from unittest import TestCase
+from prcslib.rcs import RcsFile
+
+# RCS file for tests.
+RCS_FILE = b"""head\t1.3;
+access;
+symbols;
+locks; strict;
+comment\t@# @;
+
+
+1.3
+date\t2020.04.02.00.00.00;\tauthor kazssym;\tstate Exp;
+branches;
+next\t1.2;
+
+1.2
+date\t2020.04.01.00.00.00;\tauthor kazssym;\tstate Exp;
+branches
+\t1.2.1.1;
+next\t1.1;
+
+1.1
+date\t2020.03.31.14.21.31;\tauthor kazssym;\tstate Exp;
+branches;
+next\t;
+
+1.2.1.1
+date\t2020.04.03.00.00.00;\tauthor kazssym;\tstate Exp;
+branches;
+next\t;
+
+
+desc
+@checked in by PRCS version 1 3 4
+@
+
+
+1.3
+log
+@third@@
+@
+text
+@zero
+one
+2
+three
+four
+@@at
+@
+
+
+1.2
+log
+@second
+@
+text
+@d1 1
+d6 1
+@
+
+
+1.1
+log
+@first
+@
+text
+@d2 1
+a2 1
+two
+d4 1
+@
+
+
+1.2.1.1
+log
+@branch
+@
+text
+@d4 1
+a4 1
+branch
+@
+"""
+
+# RCS file with CR characters and no final newlines.
+CR_RCS_FILE = b"""head\t1.2;
+access;
+symbols;
+locks; strict;
+comment\t@# @;
+
+
+1.2
+date\t2020.04.01.00.00.00;\tauthor kazssym;\tstate Exp;
+branches;
+next\t1.1;
+
+1.1
+date\t2020.03.31.14.21.31;\tauthor kazssym;\tstate Exp;
+branches;
+next\t;
+
+
+desc
+@@
+
+
+1.2
+log
+@second
+@
+text
+@x\ry
+z@
+
+
+1.1
+log
+@first
+@
+text
+@d2 1
+a2 1
+w\rv@
+"""
+
+class RcsFileTests(TestCase):
+    """
+    Test case class for the 'RcsFile' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        fd, name = mkstemp(suffix=",v")
+        close(fd)
+        try:
+            with open(name, "wb") as stream:
+                stream.write(RCS_FILE)
+            self._rcsfile = RcsFile(name, cache_size=2)
+        finally:
+            unlink(name)
+
+    def test_revisions(self):
+        """
+        Test the 'head' and 'revisions' methods.
+        """
+        self.assertEqual("1.3", self._rcsfile.head())
+        self.assertEqual(
+            ["1.3", "1.2", "1.1", "1.2.1.1"], self._rcsfile.revisions())
+        delta = self._rcsfile.delta("1.3")
+        self.assertEqual("kazssym", delta["author"])
+        self.assertEqual(b"third@\n", delta["log"])
+
+    def test_text(self):
+        """
+        Test the 'text' method.
+        """
+        self.assertEqual(b"one\ntwo\nthree\n", self._rcsfile.text("1.1"))
+        self.assertEqual(
+            b"zero\none\n2\nthree\nfour\n@at\n", self._rcsfile.text("1.3"))
+        self.assertEqual(b"one\n2\nthree\nfour\n", self._rcsfile.text("1.2"))
+        self.assertEqual(
+            b"one\n2\nthree\nbranch\n", self._rcsfile.text("1.2.1.1"))
+        self.assertEqual(b"one\ntwo\nthree\n", self._rcsfile.text("1.1"))
+
+    def test_text_cr(self):
+        """
+        Test the 'text' method on lines with CR characters and without final
+        newlines.
+        """
+        fd, name = mkstemp(suffix=",v")
+        close(fd)
+        try:
+            with open(name, "wb") as stream:
+                stream.write(CR_RCS_FILE)
+            rcsfile = RcsFile(name)
+        finally:
+            unlink(name)
+        self.assertEqual(b"x\ry\nz", rcsfile.text("1.2"))
+        self.assertEqual(b"x\ry\nw\rv", rcsfile.text("1.1"))
@@ -0,0 +1,124 @@
+# test_repository.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'PrcsRepository' class
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from datetime import datetime
+from os import makedirs, utime
+from os.path import join
+from unittest import skipIf
+from prcslib import PrcsRepository
+from test.fixtures import RepositoryTestCase, futures
+
+class _Project:
+    """
+    Stub of 'PrcsProject' which returns fixed versions.
+    """
+
+    def __init__(self, name, versions):
+        self._name = name
+        self._versions = versions
+
+    def versions(self):
+        return dict(
+            (version, {
+                "project": self._name,
+                "id": version,
+                "date": date,
+                "author": "kazssym",
+                "deleted": False,
+            })
+            for version, date in self._versions[self._name]
+        )
+
+class _Repository(PrcsRepository):
+    """
+    Repository which uses stub projects and counts reads.
+    """
+
+    def __init__(self, versions):
+        PrcsRepository.__init__(self, max_workers=2)
+        self.fixture = versions
+        self.reads = []
+
+    def project(self, name):
+        self.reads.append(name)
+        return _Project(name, self.fixture)
+
+class RepositoryTests(RepositoryTestCase):
+    """
+    Test case class for the 'PrcsRepository' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        RepositoryTestCase.setUp(self)
+        for name in ["alpha", "beta"]:
+            makedirs(join(self._repository, name))
+            with open(join(self._repository, name, name + ".prj,v"), "w"):
+                pass
+        # This directory is not a project.
+        makedirs(join(self._repository, "gamma"))
+
+    def test_projects(self):
+        """
+        Test the 'projects' method.
+        """
+        self.assertEqual(["alpha", "beta"], PrcsRepository.projects())
+
+    @skipIf(futures is None, "concurrent.futures is not available")
+    def test_versions(self):
+        """
+        Test the 'versions' method.
+        """
+        repository = _Repository({
+            "alpha": [
+                ("0.1", datetime(2020, 1, 1)),
+                ("0.10", datetime(2020, 3, 1)),
+                ("0.2", datetime(2020, 3, 1)),
+            ],
+            "beta": [("0.1", datetime(2020, 2, 1))],
+        })
+        self.assertEqual(
+            [("alpha", "0.1"), ("beta", "0.1"), ("alpha", "0.2"),
+             ("alpha", "0.10")],
+            [(i["project"], i["id"]) for i in repository.versions()])
+        self.assertEqual(["alpha", "beta"], sorted(repository.reads))
+
+        # Only changed projects are read again.
+        repository.reads = []
+        repository.fixture["beta"].append(("0.2", datetime(2020, 4, 1)))
+        name = join(self._repository, "beta", "beta.prj,v")
+        with open(name, "w") as stream:
+            stream.write("changed")
+        utime(name, (0, 0))
+        self.assertEqual(
+            ("beta", "0.2"),
+            tuple(repository.versions()[-1][i] for i in ["project", "id"]))
+        self.assertEqual(["beta"], repository.reads)
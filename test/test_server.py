@@ -0,0 +1,99 @@
+# test_server.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.server' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread
+from unittest import TestCase
+from prcslib.server import PrcsClient, PrcsServerError, make_server
+from prcslib.service import PrcsService
+from test.fixtures import makedescriptor
+
+class ServerTests(TestCase):
+    """
+    Test case class for the 'prcslib.server' module.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        self._tmpdir = mkdtemp()
+        service = PrcsService()
+        project = service.project("testproject")
+        # pylint: disable=protected-access
+        project._descriptors["0.1"] = makedescriptor([
+            ("a", "p/0_a", "1.1"),
+            ("b", "p/1_b", "1.1"),
+        ])
+        project._descriptors["0.2"] = makedescriptor([
+            ("a", "p/0_a", "1.2"),
+            ("c", "p/2_c", "1.1"),
+        ])
+        self._server = make_server(join(self._tmpdir, "socket"), service)
+        self._thread = Thread(target=self._server.serve_forever)
+        self._thread.start()
+        self._client = PrcsClient(join(self._tmpdir, "socket"))
+
+    def tearDown(self):
+        """
+        Tear down the test fixture.
+        """
+        self._client.close()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        rmtree(self._tmpdir)
+
+    def test_diff(self):
+        """
+        Test the 'diff' method.
+        """
+        self.assertEqual(
+            {"added": ["c"], "removed": ["b"], "modified": ["a"]},
+            self._client.diff("testproject", "0.1", "0.2"))
+        # The connection is reused for the next request.
+        self.assertEqual(
+            {"a": {"id": "p/0_a", "revision": "1.1", "mode": 0o644},
+             "b": {"id": "p/1_b", "revision": "1.1", "mode": 0o644}},
+            self._client.files("testproject", "0.1"))
+
+    def test_error(self):
+        """
+        Test errors returned by the server.
+        """
+        with self.assertRaises(PrcsServerError) as context:
+            self._client.request("nosuchmethod")
+        self.assertEqual("ValueError", context.exception.error_type)
+        # Commands which write files are not exposed.
+        with self.assertRaises(PrcsServerError) as context:
+            self._client.request(
+                "checkout", project="testproject", cwd=self._tmpdir)
+        self.assertEqual("ValueError", context.exception.error_type)
@@ -0,0 +1,115 @@
+# test_service.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'PrcsService' class
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import json
+from io import StringIO
+from unittest import TestCase
+from prcslib import PrcsVersionDescriptor, comparefiles
+from prcslib.service import PrcsService
+from test.fixtures import makedescriptor
+
+class ServiceTests(TestCase):
+    """
+    Test case class for the 'PrcsService' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        self._service = PrcsService()
+        project = self._service.project("testproject")
+        # pylint: disable=protected-access
+        project._descriptors["0.1"] = makedescriptor([
+            ("a", "p/0_a", "1.1"),
+            ("b", "p/1_b", "1.1"),
+        ])
+        project._descriptors["0.2"] = makedescriptor([
+            ("a", "p/0_a", "1.2"),
+            ("c", "p/2_c", "1.1"),
+        ])
+
+    def test_comparefiles(self):
+        """
+        Test the 'comparefiles' function.
+        """
+        result = comparefiles({"a": {"id": 1}, "b": {}}, {"a": {"id": 2}})
+        self.assertEqual(
+            {"added": [], "removed": ["b"], "modified": ["a"]}, result)
+
+    def test_diff(self):
+        """
+        Test the "diff" method.
+        """
+        response = self._service.handle({
+            "id": 1,
+            "method": "diff",
+            "params": {
+                "project": "testproject",
+                "version1": "0.1",
+                "version2": "0.2",
+            },
+        })
+        self.assertEqual(1, response["id"])
+        self.assertEqual({
+            "added": ["c"], "removed": ["b"], "modified": ["a"],
+        }, response["result"])
+
+    def test_errors(self):
+        """
+        Test responses to bad requests.
+        """
+        output = StringIO()
+        self._service.serve_lines(
+            StringIO('{"id": 2, "method": "unknown"}\n\nnot json\n'), output)
+        responses = [json.loads(i) for i in output.getvalue().splitlines()]
+        self.assertEqual(2, len(responses))
+        self.assertEqual(2, responses[0]["id"])
+        self.assertEqual("ValueError", responses[0]["error"]["type"])
+        self.assertEqual(None, responses[1]["id"])
+
+    def test_unexpected_error(self):
+        """
+        Test that an unexpected error is returned and the next request is
+        still answered.
+        """
+        broken = PrcsVersionDescriptor()
+        # pylint: disable=protected-access
+        broken._properties["Project-Version"] = []
+        self._service.project("testproject")._descriptors["0.3"] = broken
+        output = StringIO()
+        self._service.serve_lines(StringIO(
+            '{"id": 1, "method": "descriptor", "params":'
+            ' {"project": "testproject", "version": "0.3"}}\n'
+            '{"id": 2, "method": "files", "params":'
+            ' {"project": "testproject", "version": "0.1"}}\n'), output)
+        responses = [json.loads(i) for i in output.getvalue().splitlines()]
+        self.assertEqual(2, len(responses))
+        self.assertEqual("IndexError", responses[0]["error"]["type"])
+        self.assertEqual(["a", "b"], sorted(responses[1]["result"]))
@@ -0,0 +1,280 @@
+# test_sexpdata.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the parsers and the serializer of the 'prcslib.sexpdata' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+import mmap
+import sys
+from io import StringIO
+from tempfile import TemporaryFile
+from unittest import TestCase, skipIf
+from prcslib import sexpdata
+from prcslib.sexpdata import Bracket, BufferSymbol, Quoted, String, Symbol, \
+    ExpectClosingBracket, ExpectNothing
+from test.test_descriptor import DESCRIPTOR
+
+# Text whose tokens are split across chunks of every small size.
+CHUNKED_TEXT = """; comment (not parsed)
+(key "a \\"quoted\\" string" [at\\ om b] 'q) ; trailing
+(long-atom-name "esc\\\\aped\\n") nil t
+;; last comment"""
+
+class IterparseTests(TestCase):
+    """
+    Test case class for 'sexpdata.iterparse'.
+    """
+
+    def _events(self, text, chunk_size):
+        return list(sexpdata.iterparse(StringIO(text), chunk_size))
+
+    def test_events(self):
+        """
+        Test the events for a text read at once.
+        """
+        self.assertEqual([
+            ("start", "("), ("atom", Symbol("key")),
+            ("string", 'a "quoted" string'),
+            ("start", "["), ("atom", Symbol("at om")), ("atom", Symbol("b")),
+            ("end", "]"), ("quote", "'"), ("atom", Symbol("q")), ("end", ")"),
+            ("start", "("), ("atom", Symbol("long-atom-name")),
+            ("string", "esc\\aped\n"), ("end", ")"),
+            ("atom", []), ("atom", True),
+        ], self._events(CHUNKED_TEXT, 8192))
+
+    def test_chunks(self):
+        """
+        Test that tokens split across chunks are read as a whole.
+        """
+        expected = self._events(CHUNKED_TEXT, 8192)
+        for chunk_size in range(1, 24):
+            self.assertEqual(
+                expected, self._events(CHUNKED_TEXT, chunk_size),
+                "chunk size %d" % chunk_size)
+        # An atom at the end of the input is complete.
+        self.assertEqual(
+            [("atom", Symbol("abc"))], self._events("abc", 2))
+
+    def test_errors(self):
+        """
+        Test unterminated and unbalanced input.
+        """
+        for chunk_size in [1, 3, 8192]:
+            with self.assertRaises(ExpectClosingBracket):
+                self._events('(a "unterminated', chunk_size)
+            with self.assertRaises(ExpectClosingBracket):
+                self._events("(a (b)", chunk_size)
+            with self.assertRaises(ExpectClosingBracket):
+                self._events("(a]", chunk_size)
+            with self.assertRaises(ExpectNothing):
+                self._events("a)", chunk_size)
+
+class BufferParserTests(TestCase):
+    """
+    Test case class for 'sexpdata.iterparse_buffer'.
+    """
+
+    def _build(self, buffer, **kwds):
+        return sexpdata.build(sexpdata.iterparse_buffer(buffer, **kwds))
+
+    def test_buffers(self):
+        """
+        Test parsing 'bytes', 'memoryview' and 'mmap' objects.
+        """
+        content = "(a \"b c\" [d \u00e9]) nil".encode("utf-8")
+        expected = [
+            [Symbol("a"), "b c", Bracket([Symbol("d"), Symbol("\u00e9")],
+                                         "[")],
+            [],
+        ]
+        self.assertEqual(expected, self._build(content))
+        if sys.version_info >= (3,):
+            # Python 2.7 cannot match regular expressions on views.
+            self.assertEqual(expected, self._build(memoryview(content)))
+        with TemporaryFile() as stream:
+            stream.write(content)
+            stream.flush()
+            mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                result = self._build(mapped)
+                self.assertEqual(expected, result)
+                self.assertEqual(Symbol, type(result[0][0]))
+                self.assertEqual(expected, self._build(mapped, lazy=True))
+            finally:
+                mapped.close()
+
+    @skipIf(sys.version_info < (3,), "bytearray objects cannot be decoded")
+    def test_lazy_decoding(self):
+        """
+        Test that lazy atoms are decoded only when their values are used.
+        """
+        buffer = bytearray(b"(ab cd)")
+        sexp = self._build(buffer, lazy=True)[0]
+        self.assertTrue(isinstance(sexp[0], BufferSymbol))
+        # The atoms still refer to the buffer.
+        buffer[1:3] = b"xy"
+        self.assertEqual("xy", sexp[0].value())
+        self.assertEqual(Symbol("cd"), sexp[1])
+        self.assertEqual(sexp[1], Symbol("cd"))
+        self.assertNotEqual(Symbol("ab"), sexp[0])
+        self.assertNotEqual("cd", sexp[1])
+        # Only the buffer and its encoding are kept.
+        self.assertEqual((buffer, "utf-8"), sexp[0]._source)
+        self.assertEqual(
+            [Symbol("ab"), Symbol("cd")],
+            self._build(bytearray(b"(ab cd)"), lazy=True, symbol_table={})[0])
+
+    def test_escaped_atoms(self):
+        """
+        Test atoms with escapes, which are decoded when they are parsed.
+        """
+        sexp = self._build(b"(a\\ b c\\(d \"e\\\"f\\n\")")[0]
+        self.assertEqual([Symbol("a b"), Symbol("c(d"), 'e"f\n'], sexp)
+        self.assertFalse(isinstance(sexp[0], BufferSymbol))
+        self.assertEqual(
+            [Symbol("\u00e9 b")],
+            self._build("\u00e9\\ b".encode("latin-1"), encoding="latin-1"))
+
+    def test_errors(self):
+        """
+        Test malformed buffers and the skipping of whitespace and comments.
+        """
+        self.assertEqual(
+            [[Symbol("a"), Symbol("b")]],
+            self._build(b"(a ;x;y\n  ;z\n b) ;end"))
+        # This took exponential time with the indentation.
+        for text in [b"(" + b" " * 64 + b'"abc',
+                     b"(a\n" + b" ;x\n" * 64 + b'  "abc']:
+            self.assertRaises(
+                sexpdata.ExpectClosingBracket, self._build, text)
+        self.assertRaises(sexpdata.ExpectNothing, self._build, b"(a))")
+        # A quote needs a value to quote.
+        for text in [b"'", b"(a ')", b"(a ') b"]:
+            self.assertRaises(IndexError, self._build, text)
+
+class InterningTests(TestCase):
+    """
+    Test case class for symbol tables and the slots of the node classes.
+    """
+
+    def test_text_parsers(self):
+        """
+        Test interning symbols with the text parsers.
+        """
+        sexp = sexpdata.loads("(a b a (b))", symbol_table={})
+        self.assertTrue(sexp[0] is sexp[2])
+        self.assertTrue(sexp[1] is sexp[3][0])
+        events = list(sexpdata.iterparse(
+            StringIO("(a a)"), chunk_size=1, symbol_table={}))
+        self.assertTrue(events[1][1] is events[2][1])
+        # Without a symbol table, each atom is a new object.
+        sexp = sexpdata.loads("(a a)")
+        self.assertFalse(sexp[0] is sexp[1])
+
+    def test_buffer_parser(self):
+        """
+        Test interning symbols with the buffer parser.
+        """
+        table = {}
+        sexp = sexpdata.build(sexpdata.iterparse_buffer(
+            b"(a b a (b))", symbol_table=table))[0]
+        self.assertTrue(sexp[0] is sexp[2])
+        self.assertTrue(sexp[1] is sexp[3][0])
+        self.assertEqual(2, len(table))
+        # The table is shared across buffers.
+        other = sexpdata.build(sexpdata.iterparse_buffer(
+            b"(b)", symbol_table=table))[0]
+        self.assertTrue(sexp[1] is other[0])
+
+    def test_slots(self):
+        """
+        Test that the node classes have no instance dictionaries.
+        """
+        for node in [Symbol("a"), String("a"), Quoted(Symbol("a")),
+                     Bracket([], "["), BufferSymbol((b"a", "utf-8"), 0, 1)]:
+            self.assertFalse(hasattr(node, "__dict__"), repr(node))
+
+class _Stream(list):
+    """
+    List which records the chunks written to it as a stream.
+
+    Python 2.7 writes 'str' and 'unicode' chunks, which 'io.StringIO' would
+    not take together.
+    """
+    write = list.append
+
+class DumpTests(TestCase):
+    """
+    Test case class for 'sexpdata.dump' and 'sexpdata.iterdump'.
+    """
+
+    def _check(self, obj, **kwds):
+        expected = sexpdata.dumps(obj, **kwds)
+        stream = _Stream()
+        sexpdata.dump(obj, stream, **kwds)
+        self.assertEqual(expected, "".join(stream))
+        # Small chunks are joined to the same text.
+        self.assertEqual(
+            expected, "".join(sexpdata.iterdump(obj, chunk_pieces=3, **kwds)))
+
+    def test_atoms(self):
+        """
+        Test dumping atoms.
+        """
+        for obj in [Symbol("a.b"), String('a"\n'), 1, 2.5, True, False, None,
+                    "text", Quoted(Quoted(Symbol("q")))]:
+            self._check(obj)
+
+    def test_lists(self):
+        """
+        Test dumping nested lists.
+        """
+        self._check([])
+        self._check([[], [[]], Quoted([Symbol("a"), []])])
+        self._check(Bracket([Symbol("a"), ("b", 1)], "["))
+        self._check({"key": [1, 2]})
+        self._check([None, True, False, ()],
+                    none_as="null", true_as="#t", false_as="#f")
+        self._check(["a", ("b", "c")], str_as="symbol", tuple_as="array")
+        self.assertRaises(
+            ValueError, sexpdata.dump, ("a",), _Stream(), tuple_as="set")
+
+    def test_deep(self):
+        """
+        Test dumping a list nested deeper than the recursion limit.
+        """
+        obj = []
+        for __ in range(10000):
+            obj = [obj]
+        text = "".join(sexpdata.iterdump(obj))
+        self.assertEqual("(" * 10001 + ")" * 10001, text)
+
+    def test_descriptor(self):
+        """
+        Test dumping a parsed descriptor.
+        """
+        obj = sexpdata.build(sexpdata.iterparse_buffer(DESCRIPTOR.encode()))
+        self._check(obj)
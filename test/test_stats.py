@@ -0,0 +1,124 @@
+# test_stats.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.stats' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from datetime import datetime
+from unittest import TestCase, skipIf
+from prcslib import PrcsVersionDescriptor
+from prcslib import stats
+
+def _version(version, parent, date, author, files):
+    """
+    Return a pair of a summary record and a descriptor.
+    """
+    descriptor = PrcsVersionDescriptor()
+    # pylint: disable=protected-access
+    descriptor._properties = descriptor._parsecontent(
+        ("(Parent-Version testproject %s %s)\n" % tuple(
+            parent.split(".") if parent else ["-*-", "-*-"])).encode())[0]
+    descriptor._files = [
+        (name, [file_id, revision, "644"], [])
+        for name, file_id, revision in files
+    ]
+    record = {
+        "project": "testproject",
+        "id": version,
+        "date": date,
+        "author": author,
+        "deleted": False,
+    }
+    return record, descriptor
+
+HISTORY = [
+    _version("0.1", None, datetime(2020, 3, 1), "alice", [
+        ("a", "p/0_a", "1.1"),
+        ("src/b", "p/1_b", "1.1"),
+    ]),
+    _version("0.2", "0.1", datetime(2020, 3, 20), "bob", [
+        ("a", "p/0_a", "1.2"),
+        ("src/c", "p/2_c", "1.1"),
+    ]),
+    _version("0.3", "0.2", datetime(2020, 4, 2), "alice", [
+        ("a", "p/0_a", "1.2"),
+        ("src/c", "p/2_c", "1.2"),
+        ("src/d", "p/3_d", "1.1"),
+    ]),
+    # This branches from 0.1.
+    _version("1.1", "0.1", datetime(2020, 4, 3), "bob", [
+        ("a", "p/0_a", "1.1"),
+        ("src/b", "p/1_b", "1.1.1.1"),
+    ]),
+]
+
+class StatsTests(TestCase):
+    """
+    Test case class for the 'prcslib.stats' module.
+    """
+
+    def _check_churn(self, use_numpy):
+        report = stats.churn(HISTORY, use_numpy=use_numpy)
+        self.assertEqual([
+            ("0.1", {"added": 2, "removed": 0, "modified": 0}),
+            ("0.2", {"added": 1, "removed": 1, "modified": 1}),
+            ("0.3", {"added": 1, "removed": 0, "modified": 1}),
+            ("1.1", {"added": 0, "removed": 0, "modified": 1}),
+        ], list(report["by_version"].items()))
+        self.assertEqual({
+            "alice": {"added": 3, "removed": 0, "modified": 1},
+            "bob": {"added": 1, "removed": 1, "modified": 2},
+        }, dict(report["by_author"]))
+        self.assertEqual({
+            "": {"added": 1, "removed": 0, "modified": 1},
+            "src": {"added": 3, "removed": 1, "modified": 2},
+        }, dict(report["by_directory"]))
+        self.assertEqual([
+            ("2020-03", {"added": 3, "removed": 1, "modified": 1}),
+            ("2020-04", {"added": 1, "removed": 0, "modified": 2}),
+        ], list(report["by_bucket"].items()))
+
+    def test_churn(self):
+        """
+        Test the 'churn' function in plain Python.
+        """
+        self._check_churn(False)
+
+    @skipIf(stats.numpy is None, "NumPy is not available")
+    def test_churn_numpy(self):
+        """
+        Test the 'churn' function with NumPy.
+        """
+        self._check_churn(True)
+
+    def test_bucket(self):
+        """
+        Test the time buckets.
+        """
+        table = stats.ChangeTable.fromhistory(HISTORY, use_numpy=False)
+        self.assertEqual(
+            ["2020-W09", "2020-W12", "2020-W14"], list(table.bybucket("week")))
+        self.assertRaises(ValueError, table.bybucket, "hour")
@@ -0,0 +1,190 @@
+# test_watch.py
+# Copyright (C) 2026 Kaz Nishimura
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to
+# deal in the Software without restriction, including without limitation the
+# rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS
+# IN THE SOFTWARE.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+unit tests for the 'prcslib.watch' module
+"""
+
+from __future__ import absolute_import, unicode_literals
+
+from datetime import datetime
+from os import makedirs
+from os.path import join
+from threading import Event
+from unittest import TestCase, skipIf
+from prcslib import PrcsProject
+from prcslib.watch import PrcsWatcher
+from test.fixtures import RepositoryTestCase
+
+try:
+    import asyncio
+except ImportError:
+    # Python 2.7
+    asyncio = None
+
+LOG_LINES = [
+    "log: kazssym 16879 fluorite Tue, 31 Mar 2020 23:21:31 +0900 1.3.4k2:"
+    " Checking in project version 0.2.\n",
+    "log: kazssym 16879 fluorite Tue, 31 Mar 2020 23:21:32 +0900 1.3.4k2:"
+    " Finished checking in.\n",
+]
+
+class WatcherTests(RepositoryTestCase):
+    """
+    Test case class for the 'PrcsWatcher' class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test fixture.
+        """
+        RepositoryTestCase.setUp(self)
+        makedirs(join(self._repository, "testproject"))
+        self._log = join(self._repository, "testproject", "prcs_log")
+        with open(self._log, "w") as stream:
+            stream.write(
+                "log: kazssym 16000 fluorite Tue, 31 Mar 2020 23:00:00"
+                " +0900 1.3.4k2: Finished checking in.\n")
+
+    def _append(self, lines):
+        with open(self._log, "a") as stream:
+            stream.writelines(lines)
+
+    def _check_watch(self, use_inotify):
+        records = []
+        received = Event()
+
+        def callback(record):
+            records.append(record)
+            received.set()
+
+        watcher = PrcsProject("testproject").watch(
+            callback, use_inotify=use_inotify)
+        try:
+            # A partial line is not parsed until it is completed.
+            self._append([LOG_LINES[0], LOG_LINES[1][:20]])
+            self._append([LOG_LINES[1][20:]])
+            self.assertTrue(received.wait(5))
+        finally:
+            watcher.stop()
+        self.assertEqual([{
+            "project": "testproject",
+            "id": "0.2",
+            "date": datetime(2020, 3, 31, 23, 21, 32),
+            "author": "kazssym",
+            "deleted": False,
+        }], records)
+
+    def test_inotify(self):
+        """
+        Test watching with inotify where it is available.
+        """
+        self._check_watch(True)
+
+    def test_polling(self):
+        """
+        Test watching by polling.
+        """
+        self._check_watch(False)
+
+    def test_iteration(self):
+        """
+        Test iteration over new records.
+        """
+        watcher = PrcsWatcher("testproject")
+        records = iter(watcher)
+        self._append(LOG_LINES)
+        watcher.poll()
+        watcher.stop()
+        self.assertEqual(["0.2"], [record["id"] for record in records])
+
+    @skipIf(asyncio is None, "asyncio is not available")
+    def test_async_iteration(self):
+        """
+        Test asynchronous iteration over new records.
+        """
+        watcher = PrcsWatcher("testproject")
+        iterator = watcher.__aiter__()
+        self._append(LOG_LINES)
+        watcher.poll()
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            record = loop.run_until_complete(iterator.__anext__())
+            self.assertEqual("0.2", record["id"])
+            watcher.stop()
+            with self.assertRaises(StopAsyncIteration):
+                loop.run_until_complete(iterator.__anext__())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    @skipIf(not hasattr(TestCase, "assertLogs"), "assertLogs is not available")
+    def test_failing_callback(self):
+        """
+        Test that records are still delivered after a callback raises an
+        exception.
+        """
+        records = []
+
+        def callback(record):
+            records.append(record)
+            raise RuntimeError("callback failed")
+
+        watcher = PrcsWatcher("testproject", callback, use_inotify=False)
+        iterator = iter(watcher)
+        watcher.start()
+        try:
+            with self.assertLogs("prcslib.watch", "ERROR"):
+                self._append(LOG_LINES)
+                self.assertEqual("0.2", next(iterator)["id"])
+            self._append([i.replace("0.2", "0.3") for i in LOG_LINES])
+            self.assertEqual("0.3", next(iterator)["id"])
+            self.assertEqual(["0.2", "0.3"], [i["id"] for i in records])
+        finally:
+            watcher.stop()
+
+    @skipIf(asyncio is None, "asyncio is not available")
+    def test_async_cancel(self):
+        """
+        Test that a cancelled asynchronous wait leaves no thread behind.
+        """
+        watcher = PrcsWatcher("testproject")
+        iterator = watcher.__aiter__()
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            with self.assertRaises(asyncio.TimeoutError):
+                loop.run_until_complete(
+                    asyncio.wait_for(iterator.__anext__(), 0.1))
+            # pylint: disable=protected-access
+            self.assertEqual([], watcher._waiters)
+            self._append(LOG_LINES)
+            watcher.poll()
+            record = loop.run_until_complete(
+                asyncio.wait_for(iterator.__anext__(), 5))
+        finally:
+            watcher.stop()
+            asyncio.set_event_loop(None)
+            loop.close()
+        self.assertEqual("0.2", record["id"])